@@ -0,0 +1,114 @@
+import hashlib
+import json
+import sqlite3
+
+
+class AnnotationCache:
+    """
+    On-disk cache of keyword match scores per post text, in SQLite.
+
+    Texts are keyed by a hash of their content and the cache's namespace (which
+    names how the scores were computed), and store their scores by keyword text
+    (as JSON), together with the set of keywords they were scanned for. After a
+    taxonomy edit, a cached text therefore only has to be scanned for the keywords
+    it has not seen yet; keywords that were removed are ignored and keywords that
+    moved between themes need no rescan at all.
+
+    Example:
+        with AnnotationCache(path, namespace="exact") as cache:
+            entries = cache.get(text_hashes)
+            cache.put([(text_hash, {"pool": 100}, scanned_keywords)])
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS vocabularies (
+            vocabulary_id INTEGER PRIMARY KEY,
+            keywords TEXT NOT NULL UNIQUE
+        );
+        CREATE TABLE IF NOT EXISTS texts (
+            text_hash INTEGER PRIMARY KEY,
+            vocabulary_id INTEGER NOT NULL,
+            scores TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, path, namespace=""):
+        self.namespace = namespace
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(self.SCHEMA)
+        self.connection.execute("CREATE TEMP TABLE batch (text_hash INTEGER PRIMARY KEY)")
+        self._vocabularies = {}
+        self._vocabulary_ids = {}
+        for vocabulary_id, keywords in self.connection.execute("SELECT vocabulary_id, keywords FROM vocabularies"):
+            self._remember_vocabulary(vocabulary_id, frozenset(json.loads(keywords)))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def hash_text(self, text):
+        # 64 bits, so texts are keyed by SQLite's integer rowid
+        digest = hashlib.sha256(f"{self.namespace}\n{text}".encode("utf-8")).digest()
+        return int.from_bytes(digest[:8], "little", signed=True)
+
+    def _remember_vocabulary(self, vocabulary_id, keywords):
+        self._vocabularies[vocabulary_id] = keywords
+        self._vocabulary_ids[keywords] = vocabulary_id
+
+    def _get_vocabulary_id(self, keywords, added):
+        keywords = frozenset(keywords)
+        if keywords in self._vocabulary_ids:
+            return self._vocabulary_ids[keywords]
+        if keywords not in added:
+            cursor = self.connection.execute(
+                "INSERT INTO vocabularies (keywords) VALUES (?)",
+                (json.dumps(sorted(keywords)),),
+            )
+            added[keywords] = cursor.lastrowid
+        return added[keywords]
+
+    def get(self, text_hashes):
+        """
+        Look up cached texts
+
+        Returns:
+            dict: Text hash -> ({keyword: score}, frozenset of the keywords the text was scanned for),
+            for the hashes found in the cache
+        """
+        connection = self.connection
+        connection.execute("DELETE FROM batch")
+        connection.executemany("INSERT OR IGNORE INTO batch VALUES (?)", ((text_hash,) for text_hash in sorted(text_hashes)))
+
+        vocabularies = self._vocabularies
+        return {
+            text_hash: (json.loads(scores), vocabularies[vocabulary_id])
+            for text_hash, vocabulary_id, scores in connection.execute(
+                "SELECT text_hash, vocabulary_id, scores FROM batch JOIN texts USING (text_hash)"
+            )
+        }
+
+    def put(self, entries):
+        """
+        Store texts' scores, replacing what was cached for them
+
+        Args:
+            entries (iterable): (text hash, {keyword: score}, keywords the text was scanned for) tuples
+        """
+        # Vocabularies added by this put are remembered once committed, so a put that
+        # fails and is rolled back leaves no ids behind that the database lacks
+        added = {}
+        with self.connection:
+            texts = [
+                (text_hash, self._get_vocabulary_id(keywords, added), json.dumps(keyword_scores) if keyword_scores else "{}")
+                for text_hash, keyword_scores, keywords in entries
+            ]
+            # Inserting in key order keeps the B-tree writes sequential
+            texts.sort()
+            self.connection.executemany("INSERT OR REPLACE INTO texts VALUES (?, ?, ?)", texts)
+        for keywords, vocabulary_id in added.items():
+            self._remember_vocabulary(vocabulary_id, keywords)
@@ -0,0 +1,246 @@
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import time
+import tracemalloc
+from datetime import datetime
+
+import streamlit as st
+
+import developer_data as dd
+from perf_monitor import count_rows
+from synthetic_data import write_dataset
+
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+
+def get_filter_cases(store):
+    """
+    Representative filter_data arguments for the store, as (name, kwargs) pairs
+    """
+    usernames = sorted(store.accounts["username"])
+    min_date, max_date = dd.get_date_range(store)
+    top_keywords = [keyword for keyword, _ in dd.count_keywords(store).most_common(5)]
+    cases = [
+        ("themes", {"selected_themes": dd.THEME_NAMES[:3]}),
+        ("keywords", {"selected_keywords": top_keywords}),
+        ("accounts", {"selected_accounts": usernames[:max(1, len(usernames) // 10)]}),
+        ("countries", {"selected_countries": list(store.countries[:1])}),
+    ]
+    if min_date is not None:
+        cases.append(("date_range", {"date_range": (min_date, min_date.replace(year=min_date.year + 1))}))
+        cases.append(("combined", {
+            "selected_themes": dd.THEME_NAMES[:3],
+            "selected_accounts": usernames[:max(1, len(usernames) // 2)],
+            "date_range": (min_date, max_date),
+        }))
+    return cases
+
+
+# Functions benchmarked against the full store and a theme-filtered one, as
+# (name, function of the store) pairs
+BENCHMARKS = [
+    ("get_date_range", dd.get_date_range),
+    ("get_headline_metrics", dd.get_headline_metrics),
+    ("get_total_accounts", dd.get_total_accounts),
+    ("get_total_posts", dd.get_total_posts),
+    ("get_total_engagements", dd.get_total_engagements),
+    ("get_estimated_reach", dd.get_estimated_reach),
+    ("get_total_countries", dd.get_total_countries),
+    ("get_post_trend_data", dd.get_post_trend_data),
+    ("get_engagement_trend_data", dd.get_engagement_trend_data),
+    ("get_accounts", dd.get_accounts),
+    ("get_accounts_table_rows (sorted)", lambda data: dd.get_accounts_table_rows(data, "Followers", False)),
+    ("get_accounts_page", lambda data: dd.get_accounts_page(data, dd.get_accounts_table_rows(data), 2)),
+    ("get_top_accounts_by_post_count", dd.get_top_accounts_by_post_count),
+    ("count_themes", dd.count_themes),
+    ("count_keywords", dd.count_keywords),
+    ("get_top_themes", dd.get_top_themes),
+    ("get_theme_distribution", dd.get_theme_distribution),
+    ("get_theme_trend_over_time", lambda data: dd.get_theme_trend_over_time(data, dd.THEME_NAMES[:3])),
+    ("get_top_growing_themes", dd.get_top_growing_themes),
+    ("get_theme_growth_rates", dd.get_theme_growth_rates),
+    ("get_top_keywords", dd.get_top_keywords),
+    ("get_keyword_distribution", dd.get_keyword_distribution),
+    ("get_keyword_trend_over_time", lambda data: dd.get_keyword_trend_over_time(data, dd.ALL_KEYWORDS[:5])),
+    ("get_top_growing_keywords", dd.get_top_growing_keywords),
+    ("get_keyword_growth_rates", dd.get_keyword_growth_rates),
+]
+
+
+def measure(func, setup, repeat, trace_memory):
+    """
+    Time func(*setup()) `repeat` times with the st.cache_data caches cleared
+    before each call, then once more under tracemalloc for its peak memory
+
+    Returns:
+        dict: Timings in seconds, peak traced memory in bytes (None when not traced)
+            and the row counts of the input and result
+    """
+    timings = []
+    for _ in range(repeat):
+        args = setup()
+        st.cache_data.clear()
+        start = time.perf_counter()
+        result = func(*args)
+        timings.append(time.perf_counter() - start)
+
+    peak_memory = None
+    if trace_memory:
+        args = setup()
+        st.cache_data.clear()
+        tracemalloc.start()
+        func(*args)
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        "seconds": {
+            "min": min(timings),
+            "median": statistics.median(timings),
+            "max": max(timings),
+        },
+        "repeat": repeat,
+        "peak_memory_bytes": peak_memory,
+        "rows_in": count_rows(args[0]) if args else None,
+        "rows_out": count_rows(result),
+    }
+
+
+def remove_derived_files(path):
+    """
+    Delete the snapshot and annotation cache files load_post_store keeps next to path
+    """
+    for derived_path in dd.get_snapshot_paths(path).values():
+        if os.path.exists(derived_path):
+            os.remove(derived_path)
+
+
+def benchmark_size(n_posts, data_dir, repeat, trace_memory, seed):
+    """
+    Generate (or reuse) a synthetic dataset of n_posts posts and benchmark
+    loading it and every function in BENCHMARKS and filter_data on it
+
+    Yields:
+        dict: One report entry per benchmark
+    """
+    path = os.path.join(data_dir, f"synthetic_{n_posts}_{seed}.json")
+    if not os.path.exists(path):
+        print(f"Generating {n_posts} posts into {path}")
+        write_dataset(path, n_posts, seed=seed)
+
+    def entry(scenario, name, result):
+        return {"size": n_posts, "scenario": scenario, "function": name, **result}
+
+    # Loading is slow enough at the larger sizes that it is only run once
+    yield entry("load", "stream_post_store", measure(lambda: dd.stream_post_store(path), tuple, 1, trace_memory))
+    yield entry("load", "load_post_store (no snapshot)", measure(
+        lambda: dd.load_post_store(path), lambda: remove_derived_files(path) or (), 1, trace_memory,
+    ))
+    yield entry("load", "load_post_store (snapshot)", measure(lambda: dd.load_post_store(path), tuple, 1, trace_memory))
+
+    # Built once per store by get_data
+    store = dd.load_post_store(path)
+    yield entry("load", "PostIndex.build", measure(dd.PostIndex.build, lambda: (store,), repeat, trace_memory))
+    yield entry("load", "PostCube.build", measure(dd.PostCube.build, lambda: (store,), repeat, trace_memory))
+    store.get_index()
+    store.get_cube()
+
+    for name, kwargs in get_filter_cases(store):
+        yield entry("all", f"filter_data ({name})", measure(
+            lambda data: dd.filter_data(data, **kwargs), lambda: (store,), repeat, trace_memory,
+        ))
+
+    # A theme filter cannot be answered from the full store's cube, so every
+    # aggregation on it starts from the filtered posts
+    scenarios = [
+        ("all", lambda: (store,)),
+        ("themes", lambda: (dd.filter_data(store, selected_themes=dd.THEME_NAMES[:3]),)),
+    ]
+    for scenario, setup in scenarios:
+        for name, func in BENCHMARKS:
+            yield entry(scenario, name, measure(func, setup, repeat, trace_memory))
+
+
+def compare_reports(report, baseline):
+    """
+    Print the median time of every benchmark in the report against the baseline report's
+    """
+    def key(result):
+        return result["size"], result["scenario"], result["function"]
+
+    baseline_results = {key(result): result for result in baseline["results"]}
+    print(f"\n{'size':>9}  {'scenario':<8}  {'function':<40} {'baseline':>10} {'current':>10} {'speedup':>8}")
+    for result in report["results"]:
+        baseline_result = baseline_results.get(key(result))
+        if baseline_result is None:
+            continue
+        before = baseline_result["seconds"]["median"]
+        after = result["seconds"]["median"]
+        print(
+            f"{result['size']:>9}  {result['scenario']:<8}  {result['function']:<40} "
+            f"{before * 1000:8.1f}ms {after * 1000:8.1f}ms {before / after if after else float('inf'):7.2f}x"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark developer_data on synthetic data of increasing size")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Numbers of posts")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed calls per function")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc run of each function")
+    parser.add_argument("--data-dir", default="benchmark_data", help="Where synthetic datasets are generated and kept")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="benchmark_report.json")
+    parser.add_argument("--baseline", help="Earlier report to compare the median timings against")
+    args = parser.parse_args()
+
+    # Streamlit warns on every cached call (and spinner) when there is no Streamlit runtime
+    for logger_name in ("streamlit.runtime.caching.cache_data_api", "streamlit.runtime.scriptrunner_utils.script_run_context"):
+        logging.getLogger(logger_name).setLevel(logging.ERROR)
+    os.makedirs(args.data_dir, exist_ok=True)
+
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "config": {
+            "MATCH_MODE": dd.MATCH_MODE,
+            "MIN_MATCH_SCORE": dd.MIN_MATCH_SCORE,
+            "QUERY_ENGINE": dd.QUERY_ENGINE,
+            "ANNOTATION_WORKERS": dd.ANNOTATION_WORKERS,
+            "ANNOTATION_CACHE": dd.ANNOTATION_CACHE,
+            "MATCH_THREADS": dd.MATCH_THREADS,
+        },
+        "repeat": args.repeat,
+        "results": [],
+    }
+
+    print(f"{'size':>9}  {'scenario':<8}  {'function':<40} {'median':>10} {'peak memory':>12} {'rows in':>9} {'rows out':>9}")
+    for n_posts in args.sizes:
+        for result in benchmark_size(n_posts, args.data_dir, args.repeat, not args.no_memory, args.seed):
+            report["results"].append(result)
+            peak_memory = result["peak_memory_bytes"]
+            print(
+                f"{result['size']:>9}  {result['scenario']:<8}  {result['function']:<40} "
+                f"{result['seconds']['median'] * 1000:8.1f}ms "
+                f"{'' if peak_memory is None else f'{peak_memory / 2 ** 20:8.1f} MiB':>12} "
+                f"{'' if result['rows_in'] is None else result['rows_in']:>9} "
+                f"{'' if result['rows_out'] is None else result['rows_out']:>9}"
+            )
+        # Keep what has been measured if a larger size is interrupted
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    print(f"\nWrote {len(report['results'])} results to {args.output}")
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            compare_reports(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -7,57 +7,479 @@ import pandas as pd
 from datetime import datetime, timedelta
 import hashlib
 import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from functools import lru_cache
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from streamlit.runtime.scriptrunner_utils.script_run_context import SCRIPT_RUN_CONTEXT_ATTR_NAME
 from developer_data import *
+import perf_monitor
+
+
+# Run only the selected tab's charts, rerunning the page when another tab is selected
+LAZY_TABS = os.environ.get("LAZY_TABS", "1") == "1"
+# With lazy tabs, fill the other tabs' cached data once the selected tab has been drawn
+PREFETCH_TABS = os.environ.get("PREFETCH_TABS", "1") == "1"
+# Threads computing chart data, shared by every session
+CHART_WORKERS = int(os.environ.get("CHART_WORKERS", str(os.cpu_count() or 1)))
+CHART_POOL = ThreadPoolExecutor(max_workers=CHART_WORKERS, thread_name_prefix="chart-data")
+# Threads prefetching hidden tabs, kept apart from the chart workers so that a queue
+# of prefetches never delays the charts a session is waiting for
+PREFETCH_WORKERS = int(os.environ.get("PREFETCH_WORKERS", "1"))
+PREFETCH_POOL = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix="tab-prefetch")
+
+# Overview table controls, kept while the tab is hidden (see dashboard_developer)
+ACCOUNTS_TABLE_KEYS = ["accounts_search", "accounts_sort", "accounts_order", "accounts_page_size", "accounts_page"]
+
+
+def with_script_run_ctx(ctx, func):
+    """
+    Wrap func to run on a pool thread with a rerun's script context, so that Streamlit
+    caching works there as it does on the script thread. The thread's previous context
+    is put back afterwards: pool threads outlive reruns, and must neither keep a
+    finished session alive nor hand its context to the next task.
+    """
+    def wrapper(*args, **kwargs):
+        thread = threading.current_thread()
+        previous_ctx = getattr(thread, SCRIPT_RUN_CONTEXT_ATTR_NAME, None)
+        add_script_run_ctx(thread, ctx)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            setattr(thread, SCRIPT_RUN_CONTEXT_ATTR_NAME, previous_ctx)
+
+    return wrapper
+
+
+def submit_chart_data(func, *args, **kwargs):
+    """
+    Start func(*args, **kwargs) on the chart worker pool. The task runs with this
+    rerun's script context, so that Streamlit caching works there as it does on the
+    script thread, and its tracked calls are recorded in the performance panel.
+
+    Returns:
+        concurrent.futures.Future: The task's result
+    """
+    task = with_script_run_ctx(get_script_run_ctx(), perf_monitor.in_thread(func))
+    return CHART_POOL.submit(task, *args, **kwargs)
+
+
+def submit_prefetch(name, prefetch, data, *args):
+    """
+    Start filling a hidden tab's cached data with prefetch(data, *args) on the
+    prefetch pool and return without waiting for it.
+
+    Each session keeps one prefetch per tab: a prefetch of the same data with the
+    same arguments is not repeated, and one for data the session has since moved
+    away from is cancelled if it has not started yet. The prefetch can outlive the
+    rerun that started it, so its calls are not recorded in the performance panel,
+    and its arguments must not be read from the session state on the worker.
+
+    Args:
+        name (str): Tab name, for the session's prefetch and in failure messages
+        prefetch (callable): Function computing the tab's cached data
+        data (PostStore or PostSelection): Posts shown in the tab
+        *args: Further arguments of prefetch, such as the match score threshold
+    """
+    prefetches = st.session_state.setdefault("tab_prefetches", {})
+    key = (data.version, *args)
+    if name in prefetches:
+        previous_key, previous_future = prefetches[name]
+        if previous_key == key:
+            return
+        previous_future.cancel()
+
+    future = PREFETCH_POOL.submit(with_script_run_ctx(get_script_run_ctx(), prefetch), data, *args)
+    future.add_done_callback(lambda future: report_prefetch_failure(name, future))
+    prefetches[name] = (key, future)
+
+
+def report_prefetch_failure(name, future):
+    if not future.cancelled() and future.exception() is not None:
+        print(f"Failed to prefetch the {name} tab: {future.exception()!r}")
+
+
+def draw_charts(charts):
+    """
+    Draw every chart in its container as soon as its data is ready, in whatever order
+    the data arrives
+
+    Args:
+        charts (dict): Future of the chart data (see submit_chart_data) -> (container,
+            performance panel section name, function drawing the chart from the data)
+    """
+    for future in as_completed(charts):
+        container, name, draw = charts[future]
+        with container, perf_monitor.section(name):
+            draw(future.result())
+
+
+def get_top_theme_trend(data, threshold=60):
+    """
+    Monthly post counts of the top 3 themes, or None if no theme has any posts
+    """
+    top_themes_df = get_top_themes(data, threshold=threshold)
+    if top_themes_df.empty:
+        return None
+    return get_theme_trend_over_time(data, top_themes_df.head(3)["Theme"].tolist(), threshold=threshold)
+
+
+def get_top_keyword_trend(data, threshold=60):
+    """
+    Monthly post counts of the top 5 keywords, or None if no keyword has any posts
+    """
+    top_keywords_df = get_top_keywords(data, threshold=threshold)
+    if top_keywords_df.empty:
+        return None
+    return get_keyword_trend_over_time(data, top_keywords_df.head(5)["Keyword"].tolist(), threshold=threshold)
+
+
+def prefetch_overview_tab(data, sort_by, ascending, search):
+    """
+    Compute the cached data of the Overview tab's accounts table, as last sorted and searched
+    """
+    get_accounts_table_rows(data, sort_by, ascending, search)
+
+
+def prefetch_theme_tab(data, threshold):
+    """
+    Compute the cached data of every Themes tab chart
+    """
+    get_theme_distribution(data, threshold=threshold)
+    get_top_theme_trend(data, threshold=threshold)
+    get_top_growing_themes(data, threshold=threshold)
+    get_theme_growth_rates(data, threshold=threshold)
+
+
+def prefetch_keyword_tab(data, threshold):
+    """
+    Compute the cached data of every Sub Themes tab chart
+    """
+    get_keyword_distribution(data, threshold=threshold)
+    get_top_keyword_trend(data, threshold=threshold)
+    get_top_growing_keywords(data, threshold=threshold)
+    get_keyword_growth_rates(data, threshold=threshold)
+
+
+def classify_growth(rate):
+    if rate >= 0.15:
+        return "🚀 Strong Growth"
+    elif rate >= 0.05:
+        return "📈 Steady Growth"
+    else:
+        return "📉 Slow Growth"
+
+
+def draw_volume_trend_chart(post_counts_by_month):
+    # --- POST TREND LINE ---
+    if not post_counts_by_month.empty:
+        fig_post = px.line(
+            post_counts_by_month,
+            x="month",
+            y="post_count",
+            labels={"month": "Month", "post_count": "Post Count"},
+            title="Volume Trend Over Time"
+        )
+        fig_post.update_layout(xaxis_title="Month", yaxis_title="Volume")
+        st.plotly_chart(fig_post, use_container_width=True)
+    else:
+        st.info("No post trend data available for the selected filters.")
+
+
+def draw_engagement_trend_chart(engagement_by_month):
+    # --- ENGAGEMENT TREND LINE ---
+    if not engagement_by_month.empty:
+        fig_engagement = px.line(
+            engagement_by_month,
+            x="month",
+            y="total_engagement",
+            labels={"month": "Month", "total_engagement": "Engagement"},
+            title="Engagement Trend Over Time"
+        )
+        fig_engagement.update_layout(xaxis_title="Month", yaxis_title="Engagement")
+        st.plotly_chart(fig_engagement, use_container_width=True)
+    else:
+        st.info("No engagement trend data available for the selected filters.")
+
+
+def draw_top_accounts_chart(top_accounts_df):
+    # Top 5 Accounts by Post Count
+    if not top_accounts_df.empty:
+        fig_top_accounts = px.bar(
+            top_accounts_df,
+            x='Account',
+            y='Post Count',
+            text='Post Count',
+            color='Account',
+            title="Top 10 Brands by Volume"
+        )
+        fig_top_accounts.update_traces(textposition='outside')
+        fig_top_accounts.update_layout(
+            showlegend=False,
+            yaxis_title="Volume",
+            xaxis_title="Brand",
+            bargap=0.6  # Increase value (default is 0.2); try 0.4–0.6 for thinner bars
+        )
+        st.plotly_chart(fig_top_accounts, use_container_width=True, key="top_accounts_chart")
+    else:
+        st.info("No data available to show top accounts.")
+
+
+def draw_top_themes_chart(top_themes_df):
+    if not top_themes_df.empty:
+        fig_top_themes = px.bar(
+            top_themes_df,
+            x="Theme",
+            y="Post Count",
+            text="Post Count",
+            color="Theme",
+            color_discrete_map=THEME_COLOR_MAP,
+            title="Top 5 Themes by Post Count"
+        )
+        fig_top_themes.update_traces(textposition='outside')
+        fig_top_themes.update_layout(
+            showlegend=False,
+            yaxis_title="Volume Count",
+            xaxis_title="Theme",
+            bargap=0.5
+        )
+        st.plotly_chart(fig_top_themes, use_container_width=True)
+    else:
+        st.info("No theme data available for the selected filters.")
+
+
+def draw_theme_distribution_chart(theme_dist_df):
+    if not theme_dist_df.empty:
+        fig_pie = px.pie(
+            theme_dist_df,
+            names="Theme",
+            values="Post Count",
+            title="Theme-wise Post Distribution",
+            hole=0.3,
+            color="Theme",
+            color_discrete_map=THEME_COLOR_MAP
+        )
+        st.plotly_chart(fig_pie, use_container_width=True)
+    else:
+        st.info("No theme distribution data available.")
+
+
+def draw_theme_trend_chart(theme_trend_df):
+    # None when there are no top themes to follow
+    if theme_trend_df is None:
+        return
+    if not theme_trend_df.empty:
+        fig_line = px.line(
+            theme_trend_df,
+            x="Month",
+            y="Post Count",
+            color="Theme",
+            markers=True,
+            title="Trend of Top 3 Themes Over Time",
+            color_discrete_map=THEME_COLOR_MAP
+        )
+        fig_line.update_layout(xaxis_title="Month", yaxis_title="Volume")
+        st.plotly_chart(fig_line, use_container_width=True)
+    else:
+        st.info("No trend data available for top themes.")
+
+
+def draw_growing_themes_chart(growing_trends_df):
+    # Line chart showing trends over time
+    if not growing_trends_df.empty:
+        fig_growing = px.line(
+            growing_trends_df,
+            x="Month",
+            y="Post Count",
+            color="Theme",
+            markers=True,
+            title="Growth Trends Over Time"
+        )
+        fig_growing.update_layout(
+            xaxis_title="Month", 
+            yaxis_title="Volume Count",
+            hovermode='x unified'
+        )
+        st.plotly_chart(fig_growing, use_container_width=True)
+    else:
+        st.info("No growing trends data available.")
+
+
+def draw_theme_growth_rates_chart(growth_rates_df):
+    # Prepare growth rates DataFrame with human-readable summary
+    if not growth_rates_df.empty:
+        # Add a human-friendly growth summary
+        growth_rates_df["Growth Summary"] = growth_rates_df["Growth Rate"].apply(classify_growth)
+
+        fig_growth_bar = px.bar(
+            growth_rates_df,
+            x="Theme",
+            y="Growth Rate",
+            text="Growth Rate",
+            color="Theme",
+            color_discrete_map=THEME_COLOR_MAP,
+            title="Theme Growth Rates (Volume/Month)",
+            hover_data={
+                "Theme": True,
+                "Growth Rate": True,
+                "Total Posts": True,
+                "R-Squared": True,
+                "Growth Summary": True
+            }
+        )
+
+        fig_growth_bar.update_traces(textposition='outside')
+        fig_growth_bar.update_layout(
+            showlegend=False,
+            xaxis_title="Theme",
+            yaxis_title="Avg Monthly Volume Increase",
+        )
+
+        st.plotly_chart(fig_growth_bar, use_container_width=True)
+        st.markdown("**ℹ️ Growth Rate = Average number of additional posts per month mentioning the theme.**")
+    else:
+        st.info("No growth rate data available.")
+
+
+def draw_top_keywords_chart(top_keywords_df):
+    if not top_keywords_df.empty:
+        fig_top_keywords = px.bar(
+            top_keywords_df,
+            x="Keyword",
+            y="Post Count",
+            text="Post Count",
+            color="Keyword",
+            title="Top 10 Sub Themes by Post Count"
+        )
+        fig_top_keywords.update_traces(textposition='outside')
+        fig_top_keywords.update_layout(
+            showlegend=False,
+            yaxis_title="Volume Count",
+            xaxis_title="Keyword",
+            bargap=0.5,
+        )
+        st.plotly_chart(fig_top_keywords, use_container_width=True)
+    else:
+        st.info("No keyword data available for the selected filters.")
+
+
+def draw_keyword_distribution_chart(keyword_dist_df):
+    if not keyword_dist_df.empty:
+        fig_pie = px.pie(
+            keyword_dist_df,
+            names="Keyword",
+            values="Post Count",
+            title="Sub Theme-wise Volume Distribution",
+            hole=0.3,
+            color="Keyword"
+        )
+        st.plotly_chart(fig_pie, use_container_width=True)
+    else:
+        st.info("No keyword distribution data available.")
+
+
+def draw_keyword_trend_chart(keyword_trend_df):
+    # None when there are no top keywords to follow
+    if keyword_trend_df is None:
+        return
+    if not keyword_trend_df.empty:
+        fig_line = px.line(
+            keyword_trend_df,
+            x="Month",
+            y="Post Count",
+            color="Keyword",
+            markers=True,
+            title="Trend of Top 5 Sub Thems Over Time"
+        )
+        fig_line.update_layout(xaxis_title="Month", yaxis_title="Volume")
+        st.plotly_chart(fig_line, use_container_width=True)
+    else:
+        st.info("No trend data available for top keywords.")
+
+
+def draw_growing_keywords_chart(growing_keywords_df):
+    # Line chart showing trends over time
+    if not growing_keywords_df.empty:
+        fig_growing = px.line(
+            growing_keywords_df,
+            x="Month",
+            y="Post Count",
+            color="Keyword",
+            markers=True,
+            title="Sub Themes Growth Trends Over Time"
+        )
+        fig_growing.update_layout(
+            xaxis_title="Month", 
+            yaxis_title="Volume Count",
+            hovermode='x unified'
+        )
+        st.plotly_chart(fig_growing, use_container_width=True)
+    else:
+        st.info("No growing keyword trends data available.")
+
+
+def draw_keyword_growth_rates_chart(growth_rates_df):
+    # Prepare growth rates DataFrame with human-readable summary
+    if not growth_rates_df.empty:
+        # Add a human-friendly growth summary
+        growth_rates_df["Growth Summary"] = growth_rates_df["Growth Rate"].apply(classify_growth)
+
+        fig_growth_bar = px.bar(
+            growth_rates_df,
+            x="Keyword",
+            y="Growth Rate",
+            text="Growth Rate",
+            color="Keyword",
+            title="Sub Themes Growth Rates (Volume/Month)",
+            hover_data={
+                "Keyword": True,
+                "Growth Rate": True,
+                "Total Posts": True,
+                "R-Squared": True,
+                "Growth Summary": True
+            }
+        )
+
+        fig_growth_bar.update_traces(textposition='outside')
+        fig_growth_bar.update_layout(
+            showlegend=False,
+            xaxis_title="Sub Theme",
+            yaxis_title="Avg Monthly Volume Increase",
+            xaxis_tickangle=45
+        )
+
+        st.plotly_chart(fig_growth_bar, use_container_width=True)
+        st.markdown("**ℹ️ Growth Rate = Average number of additional posts per month mentioning the keyword.**")
+    else:
+        st.info("No keyword growth rate data available.")
+
+
+def get_applied_filters():
+    """
+    The filters the metrics and charts are computed with, as last applied
+    """
+    return tuple(
+        st.session_state[key]
+        for key in ["selected_themes", "selected_keywords", "selected_accounts", "date_range", "selected_countries"]
+    )
 
 
+@st.fragment
+def filter_panel(data, min_date, max_date):
+    """
+    Filter widgets with the Apply Filters and Clear Filters buttons. Editing a filter
+    reruns only this panel; the whole page reruns when a button changes the applied filters.
 
-
-
-
-def dashboard_developer():
-    # Initialize session state for storing filter values
-    if 'filter_themes' not in st.session_state:
-        st.session_state['filter_themes'] = []
-    if 'filter_keywords' not in st.session_state:
-        st.session_state['filter_keywords'] = []
-    if 'filter_accounts' not in st.session_state:
-        st.session_state['filter_accounts'] = []
-    if 'filter_date_range' not in st.session_state:
-        st.session_state['filter_date_range'] = None
-    if 'filter_countries' not in st.session_state:
-        st.session_state['filter_countries'] = []
-
-
-
-    # Initialize session state for applied filters
-    if 'selected_themes' not in st.session_state:
-        st.session_state['selected_themes'] = []
-    if 'selected_keywords' not in st.session_state:
-        st.session_state['selected_keywords'] = []
-    if 'selected_accounts' not in st.session_state:
-        st.session_state['selected_accounts'] = []
-    if 'date_range' not in st.session_state:
-        st.session_state['date_range'] = None
-    if 'selected_countries' not in st.session_state:
-        st.session_state['selected_countries'] = []
-
-
-    data = get_data()
-
-    print(f"Total accounts = {len(data)}")
-
+    Args:
+        data (PostStore): Post store the filter options are taken from
+        min_date (date): First upload date, or None
+        max_date (date): Last upload date, or None
+    """
     # Get list of all usernames for account filter
-    all_usernames = list(set([account.get('username', '') for account in data]))
+    all_usernames = list(set(data.accounts["username"]))
     all_usernames.sort()  # Sort alphabetically for better UX
 
-    # Get min and max dates from the data for the date range filter
-    min_date, max_date = get_date_range(data)
-    # Set default date range if not already in session state
-    if st.session_state['filter_date_range'] is None and min_date and max_date:
-        st.session_state['filter_date_range'] = (min_date, max_date)
-        st.session_state['date_range'] = (min_date, max_date)  # Also set applied date range
-
     # Define callback functions for all filters
     def update_theme_selection():
         if "theme_filter_callback" in st.session_state:
@@ -88,8 +510,6 @@ def dashboard_developer():
                 # For single date selection
                 st.session_state['filter_date_range'] = (date_input, date_input)
 
-    # Set the title
-    st.subheader("Brand Led Analysis")
 
     # Create a container for filters
     filter_container = st.container()
@@ -133,7 +553,7 @@ def dashboard_developer():
         
         with filter_row1_col3:
             # Get all unique countries from data
-            all_countries = sorted(list(set([account.get('country', '') for account in data if account.get('country')])))
+            all_countries = sorted(data.countries)
 
             # Country filter
             st.multiselect(
@@ -172,17 +592,23 @@ def dashboard_developer():
         with button_col1:
             # Apply Filters button
             if st.button("Apply Filters", type="primary"):
+                applied_filters = get_applied_filters()
                 st.session_state['selected_themes'] = st.session_state['filter_themes']
                 st.session_state['selected_keywords'] = st.session_state['filter_keywords']
                 st.session_state['selected_accounts'] = st.session_state['filter_accounts']
                 st.session_state['selected_countries'] = st.session_state['filter_countries']  
                 st.session_state['date_range'] = st.session_state['filter_date_range']
                 st.toast("Filters Applied", icon="✅")
+                # Rerun the metrics and charts only if the applied filters changed
+                if get_applied_filters() != applied_filters:
+                    st.rerun()
 
         
         with button_col2:
             # Clear Filters button
             if st.button("Clear Filters"):
+                applied_filters = get_applied_filters()
+
                 # Clear both the filter values and the applied filters
                 st.session_state['filter_themes'] = []
                 st.session_state['filter_keywords'] = []
@@ -199,7 +625,73 @@ def dashboard_developer():
                 if min_date and max_date:
                     st.session_state['date_range'] = (min_date, max_date)
                 
-                st.rerun()
+                # Rerun the metrics and charts only if there were filters to clear
+                if get_applied_filters() != applied_filters:
+                    st.rerun()
+
+
+def dashboard_developer():
+    # Initialize session state for storing filter values
+    if 'filter_themes' not in st.session_state:
+        st.session_state['filter_themes'] = []
+    if 'filter_keywords' not in st.session_state:
+        st.session_state['filter_keywords'] = []
+    if 'filter_accounts' not in st.session_state:
+        st.session_state['filter_accounts'] = []
+    if 'filter_date_range' not in st.session_state:
+        st.session_state['filter_date_range'] = None
+    if 'filter_countries' not in st.session_state:
+        st.session_state['filter_countries'] = []
+
+
+
+    # Initialize session state for applied filters
+    if 'selected_themes' not in st.session_state:
+        st.session_state['selected_themes'] = []
+    if 'selected_keywords' not in st.session_state:
+        st.session_state['selected_keywords'] = []
+    if 'selected_accounts' not in st.session_state:
+        st.session_state['selected_accounts'] = []
+    if 'date_range' not in st.session_state:
+        st.session_state['date_range'] = None
+    if 'selected_countries' not in st.session_state:
+        st.session_state['selected_countries'] = []
+
+    # Streamlit forgets the values of widgets that are not drawn in a rerun, which
+    # the accounts table controls are not while another tab is selected
+    for key in ACCOUNTS_TABLE_KEYS:
+        if key in st.session_state:
+            st.session_state[key] = st.session_state[key]
+
+
+    data = get_data()
+
+    # Minimum keyword match score for a post to count towards a theme or sub theme.
+    # Match scores are stored per post, so moving the slider only re-aggregates
+    if MATCH_MODE == "exact":
+        # Exact matches all score 100, so any threshold keeps them
+        match_threshold = DEFAULT_MATCH_THRESHOLD
+    else:
+        match_threshold = st.sidebar.slider(
+            "Match Strictness",
+            min_value=MIN_MATCH_SCORE,
+            max_value=100,
+            value=DEFAULT_MATCH_THRESHOLD,
+            help="Minimum fuzzy match score between a sub theme and a post's caption and hashtags",
+        )
+
+    # Get min and max dates from the data for the date range filter
+    min_date, max_date = get_date_range(data)
+    # Set default date range if not already in session state
+    if st.session_state['filter_date_range'] is None and min_date and max_date:
+        st.session_state['filter_date_range'] = (min_date, max_date)
+        st.session_state['date_range'] = (min_date, max_date)  # Also set applied date range
+
+    # Set the title
+    st.subheader("Brand Led Analysis")
+
+    # Editing the filters reruns only the filter panel
+    filter_panel(data, min_date, max_date)
 
     # Apply filters to data based on the applied filters (not the filter input values)
     filtered_data = filter_data(
@@ -208,7 +700,8 @@ def dashboard_developer():
         st.session_state['selected_keywords'],
         st.session_state['selected_accounts'],
         st.session_state['date_range'],
-        st.session_state['selected_countries']
+        st.session_state['selected_countries'],
+        threshold=match_threshold,
     )
 
     # Display the currently applied filters
@@ -242,12 +735,13 @@ def dashboard_developer():
 
 
     # Dashboard metrics with HTML tooltips (hoverable ℹ️ icon)
-    total_accounts = get_total_accounts(filtered_data)
-    total_countries = get_total_countries(filtered_data)
-    total_posts = get_total_posts(filtered_data)
-    total_engagements = get_total_engagements(filtered_data)
-    avg_post_engagement = round(total_engagements / total_posts) if total_posts > 0 else 0
-    reach = get_estimated_reach(filtered_data)
+    metrics = get_headline_metrics(filtered_data)
+    total_accounts = metrics["total_accounts"]
+    total_countries = metrics["total_countries"]
+    total_posts = metrics["total_posts"]
+    total_engagements = metrics["total_engagements"]
+    avg_post_engagement = metrics["avg_post_engagement"]
+    reach = metrics["estimated_reach"]
 
     st.markdown("""
     <style>
@@ -351,80 +845,79 @@ def dashboard_developer():
 
 
 
-    # Create tabs for Overview, Themes, and Keywords
-    overview_tab, theme_tab, keyword_tab = st.tabs(["🌐 Overview", "🎨 Themes", "🔍 Sub Themes"])
+    # Create tabs for Overview, Themes, and Keywords. With lazy tabs only the selected
+    # tab is run, and selecting another one reruns the page
+    overview_tab, theme_tab, keyword_tab = st.tabs(
+        ["🌐 Overview", "🎨 Themes", "🔍 Sub Themes"],
+        key="developer_tab",
+        on_change="rerun" if LAZY_TABS else "ignore",
+    )
 
 
 
 
-    with overview_tab:
-        with st.spinner("Loading overview graphs...."):
+    def render_overview_tab():
+        with st.spinner("Loading overview graphs...."), perf_monitor.section("Overview tab"):
 
+            # The three charts' data is computed together on the chart workers
             col1, col2 = st.columns(2)
-
-            with col1:
-                # --- POST TREND LINE ---
-                post_counts_by_month = get_post_trend_data(filtered_data)
-
-                if not post_counts_by_month.empty:
-                    fig_post = px.line(
-                        post_counts_by_month,
-                        x="month",
-                        y="post_count",
-                        labels={"month": "Month", "post_count": "Post Count"},
-                        title="Volume Trend Over Time"
-                    )
-                    fig_post.update_layout(xaxis_title="Month", yaxis_title="Volume")
-                    st.plotly_chart(fig_post, use_container_width=True)
-                else:
-                    st.info("No post trend data available for the selected filters.")
-            with col2:
-
-                # --- ENGAGEMENT TREND LINE ---
-                engagement_by_month = get_engagement_trend_data(filtered_data)
-
-                if not engagement_by_month.empty:
-                    fig_engagement = px.line(
-                        engagement_by_month,
-                        x="month",
-                        y="total_engagement",
-                        labels={"month": "Month", "total_engagement": "Engagement"},
-                        title="Engagement Trend Over Time"
-                    )
-                    fig_engagement.update_layout(xaxis_title="Month", yaxis_title="Engagement")
-                    st.plotly_chart(fig_engagement, use_container_width=True)
-                else:
-                    st.info("No engagement trend data available for the selected filters.")
-
-            # Top 5 Accounts by Post Count
-            top_accounts_df = get_top_accounts_by_post_count(filtered_data)
-
-            if not top_accounts_df.empty:
-                fig_top_accounts = px.bar(
-                    top_accounts_df,
-                    x='Account',
-                    y='Post Count',
-                    text='Post Count',
-                    color='Account',
-                    title="Top 10 Brands by Volume"
+            top_accounts_container = st.container()
+            draw_charts({
+                submit_chart_data(get_post_trend_data, filtered_data): (
+                    col1, "Volume trend chart", draw_volume_trend_chart,
+                ),
+                submit_chart_data(get_engagement_trend_data, filtered_data): (
+                    col2, "Engagement trend chart", draw_engagement_trend_chart,
+                ),
+                submit_chart_data(get_top_accounts_by_post_count, filtered_data): (
+                    top_accounts_container, "Top accounts chart", draw_top_accounts_chart,
+                ),
+            })
+
+            # Filtered accounts, searched, sorted and paged here so that only the
+            # visible page is built and sent to the browser
+            def reset_accounts_page():
+                st.session_state["accounts_page"] = 1
+
+            search_col, sort_col, order_col, size_col, page_col = st.columns([3, 2, 1, 1, 1])
+            with search_col:
+                accounts_search = st.text_input(
+                    "Search",
+                    key="accounts_search",
+                    placeholder="User name, full name, country or URL",
+                    on_change=reset_accounts_page,
                 )
-                fig_top_accounts.update_traces(textposition='outside')
-                fig_top_accounts.update_layout(
-                    showlegend=False,
-                    yaxis_title="Volume",
-                    xaxis_title="Brand",
-                    bargap=0.6  # Increase value (default is 0.2); try 0.4–0.6 for thinner bars
+            with sort_col:
+                accounts_sort = st.selectbox(
+                    "Sort by",
+                    [None, *ACCOUNT_TABLE_COLUMNS, "Post URL"],
+                    format_func=lambda column: "Post order" if column is None else column,
+                    key="accounts_sort",
+                    on_change=reset_accounts_page,
+                )
+            with order_col:
+                accounts_order = st.selectbox(
+                    "Order", ["Ascending", "Descending"], key="accounts_order", on_change=reset_accounts_page
+                )
+            with size_col:
+                # Seeded through the session state rather than index=, since the key is
+                # also re-assigned there on every rerun
+                st.session_state.setdefault("accounts_page_size", 50)
+                accounts_page_size = st.selectbox(
+                    "Rows per page", [25, 50, 100, 250, 1000], key="accounts_page_size", on_change=reset_accounts_page
                 )
-                st.plotly_chart(fig_top_accounts, use_container_width=True, key="top_accounts_chart")
-            else:
-                st.info("No data available to show top accounts.")
-
 
-            
-            
+            account_rows = get_accounts_table_rows(
+                filtered_data, accounts_sort, accounts_order == "Ascending", accounts_search.strip()
+            )
+            n_pages = max(1, -(-len(account_rows) // accounts_page_size))
+            # The filters may have left fewer pages than the one last shown
+            if st.session_state.get("accounts_page", 1) > n_pages:
+                st.session_state["accounts_page"] = n_pages
+            with page_col:
+                accounts_page = st.number_input("Page", min_value=1, max_value=n_pages, key="accounts_page")
 
-            # Get filtered accounts
-            df = get_accounts(filtered_data)
+            df = get_accounts_page(filtered_data, account_rows, accounts_page, accounts_page_size)
 
             # ⚙️ Column config for links
             column_config = {
@@ -433,291 +926,88 @@ def dashboard_developer():
                 "Post URL": st.column_config.LinkColumn("Post URL", display_text="Open"),
             }
 
-            # Start index from 1 instead of 0
-            df.index = range(1, len(df) + 1)
-
-            # 📋 Show filtered table
+            # 📋 Show the page of the filtered table
             st.dataframe(df, column_config=column_config)
+            if len(df):
+                st.caption(f"Showing {df.index[0]:,}–{df.index[-1]:,} of {len(account_rows):,} posts (page {accounts_page} of {n_pages})")
+            else:
+                st.caption("No posts match the search.")
 
 
     
-    # Content for the Themes Tab
-    with theme_tab:
-        col1, col2 = st.columns(2)
-
-        with col1:
-            with st.spinner("Chart loading"):
-                top_themes_df = get_top_themes(filtered_data)
-
-                if not top_themes_df.empty:
-                    fig_top_themes = px.bar(
-                        top_themes_df,
-                        x="Theme",
-                        y="Post Count",
-                        text="Post Count",
-                        color="Theme",
-                        color_discrete_map=THEME_COLOR_MAP,
-                        title="Top 5 Themes by Post Count"
-                    )
-                    fig_top_themes.update_traces(textposition='outside')
-                    fig_top_themes.update_layout(
-                        showlegend=False,
-                        yaxis_title="Volume Count",
-                        xaxis_title="Theme",
-                        bargap=0.5
-                    )
-                    st.plotly_chart(fig_top_themes, use_container_width=True)
-                else:
-                    st.info("No theme data available for the selected filters.")
-
-        with col2:
-            with st.spinner("Chart loading"):
-                theme_dist_df = get_theme_distribution(filtered_data)
-
-                if not theme_dist_df.empty:
-                    fig_pie = px.pie(
-                        theme_dist_df,
-                        names="Theme",
-                        values="Post Count",
-                        title="Theme-wise Post Distribution",
-                        hole=0.3,
-                        color="Theme",
-                        color_discrete_map=THEME_COLOR_MAP
-                    )
-                    st.plotly_chart(fig_pie, use_container_width=True)
-                else:
-                    st.info("No theme distribution data available.")
-
-        with st.spinner("Chart loading"):        
-            if not top_themes_df.empty:
-                top_3 = top_themes_df.head(3)["Theme"].tolist()
-                theme_trend_df = get_theme_trend_over_time(filtered_data, top_3)
-
-                if not theme_trend_df.empty:
-                    fig_line = px.line(
-                        theme_trend_df,
-                        x="Month",
-                        y="Post Count",
-                        color="Theme",
-                        markers=True,
-                        title="Trend of Top 3 Themes Over Time",
-                        color_discrete_map=THEME_COLOR_MAP
-                    )
-                    fig_line.update_layout(xaxis_title="Month", yaxis_title="Volume")
-                    st.plotly_chart(fig_line, use_container_width=True)
-                else:
-                    st.info("No trend data available for top themes.")
-        
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            with st.spinner("Chart loading"):
-                # Line chart showing trends over time
-                growing_trends_df = get_top_growing_themes(filtered_data)
-                
-                if not growing_trends_df.empty:
-                    fig_growing = px.line(
-                        growing_trends_df,
-                        x="Month",
-                        y="Post Count",
-                        color="Theme",
-                        markers=True,
-                        title="Growth Trends Over Time"
-                    )
-                    fig_growing.update_layout(
-                        xaxis_title="Month", 
-                        yaxis_title="Volume Count",
-                        hovermode='x unified'
-                    )
-                    st.plotly_chart(fig_growing, use_container_width=True)
-                else:
-                    st.info("No growing trends data available.")
-        
-        with col2:
-
-            with st.spinner("Chart loading"):
-                # Prepare growth rates DataFrame with human-readable summary
-                growth_rates_df = get_theme_growth_rates(filtered_data)
-
-                if not growth_rates_df.empty:
-                    # Add a human-friendly growth summary
-                    def classify_growth(rate):
-                        if rate >= 0.15:
-                            return "🚀 Strong Growth"
-                        elif rate >= 0.05:
-                            return "📈 Steady Growth"
-                        else:
-                            return "📉 Slow Growth"
-                    
-                    growth_rates_df["Growth Summary"] = growth_rates_df["Growth Rate"].apply(classify_growth)
-
-                    fig_growth_bar = px.bar(
-                        growth_rates_df,
-                        x="Theme",
-                        y="Growth Rate",
-                        text="Growth Rate",
-                        color="Theme",
-                        color_discrete_map=THEME_COLOR_MAP,
-                        title="Theme Growth Rates (Volume/Month)",
-                        hover_data={
-                            "Theme": True,
-                            "Growth Rate": True,
-                            "Total Posts": True,
-                            "R-Squared": True,
-                            "Growth Summary": True
-                        }
-                    )
-
-                    fig_growth_bar.update_traces(textposition='outside')
-                    fig_growth_bar.update_layout(
-                        showlegend=False,
-                        xaxis_title="Theme",
-                        yaxis_title="Avg Monthly Volume Increase",
-                    )
-
-                    st.plotly_chart(fig_growth_bar, use_container_width=True)
-                    st.markdown("**ℹ️ Growth Rate = Average number of additional posts per month mentioning the theme.**")
-                else:
-                    st.info("No growth rate data available.")
-            
-
-            
-
-
-    # Content for the Keywords Tab
-    with keyword_tab:
-        col1, col2 = st.columns(2)
-
-        with col1:
-            with st.spinner("Chart loading"):
-                top_keywords_df = get_top_keywords(filtered_data)
-
-                if not top_keywords_df.empty:
-                    fig_top_keywords = px.bar(
-                        top_keywords_df,
-                        x="Keyword",
-                        y="Post Count",
-                        text="Post Count",
-                        color="Keyword",
-                        title="Top 10 Sub Themes by Post Count"
-                    )
-                    fig_top_keywords.update_traces(textposition='outside')
-                    fig_top_keywords.update_layout(
-                        showlegend=False,
-                        yaxis_title="Volume Count",
-                        xaxis_title="Keyword",
-                        bargap=0.5,
-                    )
-                    st.plotly_chart(fig_top_keywords, use_container_width=True)
-                else:
-                    st.info("No keyword data available for the selected filters.")
-
-        with col2:
-            with st.spinner("Chart loading"):
-                keyword_dist_df = get_keyword_distribution(filtered_data)
-
-                if not keyword_dist_df.empty:
-                    fig_pie = px.pie(
-                        keyword_dist_df,
-                        names="Keyword",
-                        values="Post Count",
-                        title="Sub Theme-wise Volume Distribution",
-                        hole=0.3,
-                        color="Keyword"
-                    )
-                    st.plotly_chart(fig_pie, use_container_width=True)
-                else:
-                    st.info("No keyword distribution data available.")
-
-
-        with st.spinner("Chart loading"):        
-            if not top_keywords_df.empty:
-                top_5 = top_keywords_df.head(5)["Keyword"].tolist()
-                keyword_trend_df = get_keyword_trend_over_time(filtered_data, top_5)
-
-                if not keyword_trend_df.empty:
-                    fig_line = px.line(
-                        keyword_trend_df,
-                        x="Month",
-                        y="Post Count",
-                        color="Keyword",
-                        markers=True,
-                        title="Trend of Top 5 Sub Thems Over Time"
-                    )
-                    fig_line.update_layout(xaxis_title="Month", yaxis_title="Volume")
-                    st.plotly_chart(fig_line, use_container_width=True)
-                else:
-                    st.info("No trend data available for top keywords.")
-        
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            with st.spinner("Chart loading"):
-                # Line chart showing trends over time
-                growing_keywords_df = get_top_growing_keywords(filtered_data)
-                
-                if not growing_keywords_df.empty:
-                    fig_growing = px.line(
-                        growing_keywords_df,
-                        x="Month",
-                        y="Post Count",
-                        color="Keyword",
-                        markers=True,
-                        title="Sub Themes Growth Trends Over Time"
-                    )
-                    fig_growing.update_layout(
-                        xaxis_title="Month", 
-                        yaxis_title="Volume Count",
-                        hovermode='x unified'
-                    )
-                    st.plotly_chart(fig_growing, use_container_width=True)
-                else:
-                    st.info("No growing keyword trends data available.")
-        
-        with col2:
-            with st.spinner("Chart loading"):
-                # Prepare growth rates DataFrame with human-readable summary
-                growth_rates_df = get_keyword_growth_rates(filtered_data)
-
-                if not growth_rates_df.empty:
-                    # Add a human-friendly growth summary
-                    def classify_growth(rate):
-                        if rate >= 0.15:
-                            return "🚀 Strong Growth"
-                        elif rate >= 0.05:
-                            return "📈 Steady Growth"
-                        else:
-                            return "📉 Slow Growth"
-                    
-                    growth_rates_df["Growth Summary"] = growth_rates_df["Growth Rate"].apply(classify_growth)
-
-                    fig_growth_bar = px.bar(
-                        growth_rates_df,
-                        x="Keyword",
-                        y="Growth Rate",
-                        text="Growth Rate",
-                        color="Keyword",
-                        title="Sub Themes Growth Rates (Volume/Month)",
-                        hover_data={
-                            "Keyword": True,
-                            "Growth Rate": True,
-                            "Total Posts": True,
-                            "R-Squared": True,
-                            "Growth Summary": True
-                        }
-                    )
-
-                    fig_growth_bar.update_traces(textposition='outside')
-                    fig_growth_bar.update_layout(
-                        showlegend=False,
-                        xaxis_title="Sub Theme",
-                        yaxis_title="Avg Monthly Volume Increase",
-                        xaxis_tickangle=45
-                    )
-
-                    st.plotly_chart(fig_growth_bar, use_container_width=True)
-                    st.markdown("**ℹ️ Growth Rate = Average number of additional posts per month mentioning the keyword.**")
-                else:
-                    st.info("No keyword growth rate data available.")
\ No newline at end of file
+    # Content for the Themes Tab. Every chart's data is computed on the chart workers
+    # at once, and each chart is drawn in its place as soon as its data arrives
+    def render_theme_tab():
+        with st.spinner("Chart loading"):
+            col1, col2 = st.columns(2)
+            trend_container = st.container()
+            col3, col4 = st.columns(2)
+            draw_charts({
+                submit_chart_data(get_top_themes, filtered_data, threshold=match_threshold): (
+                    col1, "Top themes chart", draw_top_themes_chart,
+                ),
+                submit_chart_data(get_theme_distribution, filtered_data, threshold=match_threshold): (
+                    col2, "Theme distribution chart", draw_theme_distribution_chart,
+                ),
+                submit_chart_data(get_top_theme_trend, filtered_data, threshold=match_threshold): (
+                    trend_container, "Theme trend chart", draw_theme_trend_chart,
+                ),
+                submit_chart_data(get_top_growing_themes, filtered_data, threshold=match_threshold): (
+                    col3, "Growing themes chart", draw_growing_themes_chart,
+                ),
+                submit_chart_data(get_theme_growth_rates, filtered_data, threshold=match_threshold): (
+                    col4, "Theme growth rates chart", draw_theme_growth_rates_chart,
+                ),
+            })
+
+
+    # Content for the Keywords Tab, laid out and computed like the Themes Tab
+    def render_keyword_tab():
+        with st.spinner("Chart loading"):
+            col1, col2 = st.columns(2)
+            trend_container = st.container()
+            col3, col4 = st.columns(2)
+            draw_charts({
+                submit_chart_data(get_top_keywords, filtered_data, threshold=match_threshold): (
+                    col1, "Top sub themes chart", draw_top_keywords_chart,
+                ),
+                submit_chart_data(get_keyword_distribution, filtered_data, threshold=match_threshold): (
+                    col2, "Sub theme distribution chart", draw_keyword_distribution_chart,
+                ),
+                submit_chart_data(get_top_keyword_trend, filtered_data, threshold=match_threshold): (
+                    trend_container, "Sub theme trend chart", draw_keyword_trend_chart,
+                ),
+                submit_chart_data(get_top_growing_keywords, filtered_data, threshold=match_threshold): (
+                    col3, "Growing sub themes chart", draw_growing_keywords_chart,
+                ),
+                submit_chart_data(get_keyword_growth_rates, filtered_data, threshold=match_threshold): (
+                    col4, "Sub theme growth rates chart", draw_keyword_growth_rates_chart,
+                ),
+            })
+
+
+    # Tab, its body, and the prefetch of its data with the arguments after the data.
+    # The accounts table is prefetched as last sorted and searched.
+    tabs = [
+        (overview_tab, render_overview_tab, "Overview", prefetch_overview_tab, (
+            st.session_state.get("accounts_sort"),
+            st.session_state.get("accounts_order", "Ascending") == "Ascending",
+            st.session_state.get("accounts_search", "").strip(),
+        )),
+        (theme_tab, render_theme_tab, "Themes", prefetch_theme_tab, (match_threshold,)),
+        (keyword_tab, render_keyword_tab, "Sub Themes", prefetch_keyword_tab, (match_threshold,)),
+    ]
+
+    # Without lazy tabs, no tab knows whether it is open and every tab is run
+    for tab, render, *_ in tabs:
+        if tab.open is not False:
+            with tab:
+                render()
+
+    # The selected tab has been sent to the browser by now, so the other tabs'
+    # data can be computed ahead of time on the prefetch workers. The rerun does not
+    # wait for it, so switching tabs or paging the table is never held up by it.
+    if LAZY_TABS and PREFETCH_TABS:
+        for tab, _, name, prefetch, args in tabs:
+            if tab.open is False:
+                submit_prefetch(name, prefetch, filtered_data, *args)
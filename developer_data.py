@@ -4,249 +4,315 @@ import hashlib
 from urllib.parse import quote_plus
 import pandas as pd
 import plotly.express as px
-import streamlit as st
 from datetime import datetime, date
 from collections import Counter
-from rapidfuzz import fuzz
-from collections import defaultdict
-from scipy.stats import linregress
+from rapidfuzz import fuzz, process
+from collections import OrderedDict, defaultdict
+from scipy import sparse
 import numpy as np
-
-
-
-
-@st.cache_data
+import os
+import sqlite3
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import uuid
+import threading
+import pyarrow as pa
+from keyword_matcher import KeywordMatcher
+from json_stream import JSONStreamReader
+from annotation_cache import AnnotationCache
+import perf_monitor
+
+
+DATA_PATH = "translated_output.json"
+
+# Bump when the snapshot layout changes so old snapshots are rebuilt
+SNAPSHOT_VERSION = 1
+
+# Stream translated_output.json instead of json.load-ing it whole; peak memory
+# during ingest is then bounded by INGEST_BATCH_SIZE buffered posts
+STREAMING_INGEST = os.environ.get("STREAMING_INGEST", "1") == "1"
+INGEST_BATCH_SIZE = int(os.environ.get("INGEST_BATCH_SIZE", "50000"))
+# Processes used to match keywords at ingest (1 matches in-process) and the
+# number of posts each one is handed at a time. Matching in-process is the default,
+# since get_data runs on a thread of the Streamlit server; worker processes are
+# spawned rather than forked from it (see PostStoreBuilder._match).
+ANNOTATION_WORKERS = int(os.environ.get("ANNOTATION_WORKERS", "1"))
+ANNOTATION_CHUNK_SIZE = int(os.environ.get("ANNOTATION_CHUNK_SIZE", "2000"))
+# Keep keyword matches per post text in an SQLite file next to the data, so
+# re-ingesting only matches texts (or keywords) that have not been seen before
+ANNOTATION_CACHE = os.environ.get("ANNOTATION_CACHE", "1") == "1"
+# How keywords are scored against post text: "exact" keeps the keywords that occur
+# in the text (which always score 100); "partial" and "token_set" score every
+# keyword with fuzz.partial_ratio / fuzz.token_set_ratio and keep those scoring at
+# least MIN_MATCH_SCORE, so the match threshold can be tuned from the dashboard.
+# The floor bounds the size of the stored scores: on the sample captions, partial
+# keeps about 7 of the 420 keywords per post at 85 (under 2% of the matrix), but
+# about 150 (36%) at 50, where every post is tagged with some theme; token_set
+# keeps about 1.6 per post at 85
+MATCH_MODE = os.environ.get("MATCH_MODE", "exact")
+MIN_MATCH_SCORE = int(os.environ.get("MIN_MATCH_SCORE", "85"))
+# Match score threshold the dashboard starts at, and the one get_data builds the
+# first cube for; lower thresholds would count matches that were never stored
+DEFAULT_MATCH_THRESHOLD = max(60, MIN_MATCH_SCORE)
+# Threads rapidfuzz scores fuzzy matches on when matching in-process; annotation
+# worker processes use one each
+MATCH_THREADS = int(os.environ.get("MATCH_THREADS", str(os.cpu_count() or 1)))
+# Identifies the stored scores in snapshots, dataset versions and the annotation cache
+MATCH_SCORER = MATCH_MODE if MATCH_MODE == "exact" else f"{MATCH_MODE}-{MIN_MATCH_SCORE}"
+# "pandas" (default) or "duckdb" to run filters and cube aggregations as SQL
+QUERY_ENGINE = os.environ.get("QUERY_ENGINE", "pandas")
+# PostCubes a store keeps, for the most recently used match score thresholds. By
+# default one per position of the dashboard's threshold slider (16 at 85), so
+# sweeping it never rebuilds a cube; each takes about as much memory as the store's
+# numeric columns and scores (1.6 MB per 5k posts on the sample data)
+CUBE_CACHE_SIZE = int(os.environ.get("CUBE_CACHE_SIZE", str(101 - DEFAULT_MATCH_THRESHOLD)))
+
+if QUERY_ENGINE == "duckdb":
+    from duckdb_engine import DuckDBEngine
+
+
+# A resource rather than st.cache_data, which would hand every session and rerun
+# its own unpickled copy of the whole store
+@perf_monitor.cache_resource()
 def get_data():
     try:
-        with open("translated_output.json", "r", encoding='utf-8') as f:
-            data = json.load(f)
-        print("Loaded data from JSON file")
-        return data
+        store = load_post_store(DATA_PATH)
     except Exception as e:
         print(f"Failed to load data from JSON: {e}")
-        return []
+        store = build_post_store([])
+
+    # Build the filter indexes and the aggregate cube for the dashboard's default
+    # threshold once, so they are cached along with the data
+    store.get_index()
+    store.get_cube(DEFAULT_MATCH_THRESHOLD)
+    return store
 
 
 
+@perf_monitor.track
 def get_date_range(data):
     """
     Get minimum and maximum dates from all posts in the data
     
     Args:
-        data (list): List of account data
+        data (PostStore or PostSelection): Posts
         
     Returns:
         tuple: (min_date, max_date) as datetime.date objects, or (None, None) if no valid dates
     """
-    all_dates = []
-    
-    for account in data:
-        for post in account.get("posts", []):
-            upload_date_str = post.get("upload_date")
-            if upload_date_str:
-                try:
-                    upload_date = datetime.strptime(upload_date_str, "%Y-%m-%d").date()
-                    all_dates.append(upload_date)
-                except ValueError:
-                    pass  # Skip malformed dates
+    if isinstance(data, PostSelection):
+        date_ordinals = data.column("date_ordinal")
+        date_ordinals = date_ordinals[date_ordinals != MISSING_DATE]
+        if len(date_ordinals):
+            return date.fromordinal(int(date_ordinals.min())), date.fromordinal(int(date_ordinals.max()))
+        return None, None
+
+    sorted_dates = data.get_index().sorted_dates
     
-    if all_dates:
-        return min(all_dates), max(all_dates)
+    if len(sorted_dates):
+        return date.fromordinal(int(sorted_dates[0])), date.fromordinal(int(sorted_dates[-1]))
     else:
         return None, None
 
 
-def filter_data(data, selected_themes=None, selected_keywords=None, selected_accounts=None, date_range=None, selected_countries=None):
+@perf_monitor.track
+def filter_data(data, selected_themes=None, selected_keywords=None, selected_accounts=None, date_range=None, selected_countries=None,
+                threshold=60):
     """
-    Filter the data based on selected themes, keywords, accounts, date range, and countries
+    Filter the data based on selected themes, keywords, accounts, date range, and countries.
+    A post mentions a theme or keyword if its match scores at least `threshold`, as in
+    the charts.
+
+    Returns:
+        PostStore or PostSelection: The store itself when no filter is applied, otherwise
+            a selection of its matching post rows that shares the store's columns
     """
     # If no filters applied, return original data
     if not selected_themes and not selected_keywords and not selected_accounts and not date_range and not selected_countries:
         return data
-        
-    filtered_data = []
-    
-    for account in data:
-        username = account.get("username", "")
-        country = account.get("country", "")
-        
-        # Filter by account
-        account_match = True
-        if selected_accounts:
-            account_match = username in selected_accounts
-        
-        # Filter by country
-        country_match = True
-        if selected_countries:
-            country_match = country in selected_countries
-        
-        if not (account_match and country_match):
-            continue
-        
-        filtered_account = account.copy()
-        filtered_posts = []
-        
-        for post in account.get("posts", []):
-            caption = (post.get("caption") or "").lower()
-            hashtags = [h.lower() for h in post.get("hashtags", [])]
-            text_blob = caption + " " + " ".join(hashtags)
-
-
-            
-            # Check date range
-            date_match = True
-            if date_range and isinstance(date_range, tuple) and len(date_range) == 2:
-                upload_date_str = post.get("upload_date")
-                if upload_date_str:
-                    try:
-                        upload_date = datetime.strptime(upload_date_str, "%Y-%m-%d").date()
-                        start_date, end_date = date_range
-                        if isinstance(start_date, datetime):
-                            start_date = start_date.date()
-                        if isinstance(end_date, datetime):
-                            end_date = end_date.date()
-                        date_match = start_date <= upload_date <= end_date
-                    except ValueError:
-                        date_match = False
-                else:
-                    date_match = False
-            
-            if not date_match:
-                continue
 
-            # Check themes
-            theme_match = True
-            if selected_themes:
-                post_themes = []
-                for theme, keywords in THEME_KEYWORDS.items():
-                    if any(keyword.lower() in text_blob for keyword in keywords):
-                        post_themes.append(theme)
-                
-                if not post_themes:
-                    theme_match = True
-                elif any(theme in selected_themes for theme in post_themes):
-                    theme_match = True
-                else:
-                    theme_match = False
-
-            # Check keywords
-            keyword_match = True
-            if selected_keywords:
-                if not any(keyword.lower() in text_blob for keyword in selected_keywords):
-                    keyword_match = False
-            
-            if theme_match and keyword_match:
-                filtered_posts.append(post)
-        
-        if filtered_posts:
-            filtered_account["posts"] = filtered_posts
-            filtered_data.append(filtered_account)
-    
-    return filtered_data
+    index = data.get_index()
+    account_codes = country_codes = date_bounds = theme_ids = keyword_ids = other_keywords = None
+
+    # Account, country and whole-month filters can also be applied to the
+    # aggregate cube directly (see PostStore.get_cube)
+    cube_selection = {}
+
+    # Filter by account
+    if selected_accounts:
+        account_codes = np.flatnonzero(data.accounts["username"].isin(selected_accounts).to_numpy())
+        cube_selection["account_codes"] = account_codes
+
+    # Filter by country
+    if selected_countries:
+        country_codes = [code for code, country in enumerate(data.countries) if country in selected_countries]
+        cube_selection["country_codes"] = country_codes
+
+    # Check date range
+    if date_range and isinstance(date_range, tuple) and len(date_range) == 2:
+        start_date, end_date = date_range
+        if isinstance(start_date, datetime):
+            start_date = start_date.date()
+        if isinstance(end_date, datetime):
+            end_date = end_date.date()
+        date_bounds = (start_date.toordinal(), end_date.toordinal())
+
+        # The range selects whole months if no post falls in the part of its first
+        # or last month that it leaves out
+        first_month, last_month = date_to_month_id(start_date), date_to_month_id(end_date)
+        first_month_start = month_id_to_date(first_month).toordinal()
+        last_month_end = month_id_to_date(last_month + 1).toordinal() - 1
+        if (
+            len(index.date_range_rows(first_month_start, date_bounds[0] - 1)) == 0
+            and len(index.date_range_rows(date_bounds[1] + 1, last_month_end)) == 0
+        ):
+            cube_selection["month_range"] = (first_month, last_month)
+        else:
+            cube_selection = None
+
+    # Check themes
+    if selected_themes:
+        theme_ids = [theme_id for theme_id, theme in enumerate(THEME_NAMES) if theme in selected_themes]
+        cube_selection = None
+
+    # Check keywords. Selected keywords from the THEME_KEYWORDS vocabulary are
+    # resolved to keyword ids; anything else is matched against the post text
+    if selected_keywords:
+        keyword_ids = []
+        other_keywords = []
+        for keyword in selected_keywords:
+            if keyword.lower() in KEYWORD_IDS_BY_TEXT:
+                keyword_ids.extend(KEYWORD_IDS_BY_TEXT[keyword.lower()])
+            else:
+                other_keywords.append(keyword)
+        cube_selection = None
+
+    if QUERY_ENGINE == "duckdb":
+        rows = data.get_engine().filter_rows(
+            account_codes, country_codes, date_bounds, theme_ids, keyword_ids, other_keywords, threshold,
+        )
+    else:
+        rows = _filter_rows(data, account_codes, country_codes, date_bounds, theme_ids, keyword_ids, other_keywords, threshold)
+
+    filter_key = (
+        tuple(sorted(selected_themes or ())),
+        tuple(sorted(selected_keywords or ())),
+        tuple(sorted(selected_accounts or ())),
+        tuple(str(day) for day in date_range or ()),
+        tuple(sorted(selected_countries or ())),
+        threshold,
+    )
+    filter_hash = hashlib.sha256(repr(filter_key).encode("utf-8")).hexdigest()[:16]
+    return PostSelection(data, rows, version=f"{data.version}/{filter_hash}", cube_selection=cube_selection)
+
+
+def _filter_rows(data, account_codes, country_codes, date_bounds, theme_ids, keyword_ids, other_keywords, threshold):
+    """
+    Resolve filter_data's selections to post rows through the store's PostIndex
+    """
+    posts = data.posts
+    index = data.get_index()
+    mask = np.ones(len(posts), dtype=bool)
+
+    if account_codes is not None:
+        mask &= index.accounts.bitmap(account_codes, len(posts))
+
+    if country_codes is not None:
+        mask &= index.countries.bitmap(country_codes, len(posts))
+
+    if date_bounds is not None:
+        date_match = np.zeros(len(posts), dtype=bool)
+        date_match[index.date_range_rows(*date_bounds)] = True
+        mask &= date_match
+
+    # A post mentions a theme if any of the theme's keywords matches it. Posts that
+    # mention no theme at all are kept
+    if theme_ids is not None:
+        theme_keyword_ids = np.flatnonzero(np.isin(KEYWORD_THEME_IDS, theme_ids))
+        theme_match = index.keywords.bitmap(theme_keyword_ids, len(posts), threshold)
+        untagged = index.max_scores < threshold
+        mask &= untagged | theme_match
+
+    # Keywords outside the vocabulary are matched with a one-off automaton
+    if keyword_ids is not None:
+        keyword_match = index.keywords.bitmap(keyword_ids, len(posts), threshold)
+        if other_keywords:
+            other_keyword_matcher = KeywordMatcher(other_keywords)
+            texts = posts["text"].to_numpy()
+            for row in np.flatnonzero(mask & ~keyword_match):
+                keyword_match[row] = bool(other_keyword_matcher.find_ids(texts[row]))
+        mask &= keyword_match
+
+    return np.flatnonzero(mask)
 
 
 
+@perf_monitor.track
 def get_total_accounts(data):
-    return len(data)
+    return len(data.account_ids)
 
 
-def get_total_engagements(data):
-    total_engagements = 0
-    for account in data:
-        for post in account.get("posts", []):
-            total_engagements += post.get("number_of_likes", 0) or 0
-            total_engagements += post.get("number_of_comments", 0) or 0
-            total_engagements += post.get("video_view_count", 0) or 0
+def get_post_engagement(posts):
+    """
+    Sum of likes, comments and video views for each post row
+    """
+    return posts["likes"] + posts["comments"] + posts["views"]
 
-    return total_engagements
 
+@perf_monitor.track
+def get_total_engagements(data):
+    return get_headline_metrics(data)["total_engagements"]
 
-def get_total_posts(data):
-    total_posts = 0
-    for account in data:
-        total_posts += len(account.get("posts", []))
 
-    return total_posts
+@perf_monitor.track
+def get_total_posts(data):
+    return len(data)
 
 
 # Heuristic: assume ~10% of followers see a post + a boost from engagement
-def estimate_post_reach(post, followers):
-    likes = post.get("number_of_likes", 0) or 0
-    comments = post.get("number_of_comments", 0) or 0
-    views = post.get("video_view_count", 0) or 0
-
-    engagement = likes + comments + views
+def estimate_post_reach(engagement, followers):
     return (0.1 * followers) + (0.05 * engagement)
 
 
+@perf_monitor.track
 def get_estimated_reach(data):
-    estimated_reach = 0
-    for account in data:
-        followers = account.get("followers", 0)
-        for post in account.get("posts", []):
-            estimated_reach += estimate_post_reach(post, followers)
-    return int(estimated_reach)
+    return get_headline_metrics(data)["estimated_reach"]
 
 
+@perf_monitor.track
 def get_post_trend_data(data):
-    post_dates = []
-    for account in data:
-        for post in account.get("posts", []):
-            upload_date_str = post.get("upload_date")
-            if upload_date_str:
-                try:
-                    upload_date = datetime.strptime(upload_date_str, "%Y-%m-%d").date()
-                    post_dates.append(upload_date)
-                except ValueError:
-                    pass  # skip malformed dates
+    cells = data.get_cube().posts
+    dated = cells["month_id"] != MISSING_MONTH
 
     # If no posts match the filters, return an empty dataframe
-    if not post_dates:
+    if not dated.any():
         return pd.DataFrame(columns=["month", "post_count"])
-        
-    # Step 2: Create DataFrame and convert the date column to datetime
-    df_posts = pd.DataFrame(post_dates, columns=["date"])
-    df_posts["date"] = pd.to_datetime(df_posts["date"])  # Ensure 'date' column is datetime type
-
-    # Extract month-year for grouping
-    df_posts["month"] = df_posts["date"].dt.to_period("M").dt.to_timestamp()
 
     # Group by month and count posts
-    post_counts_by_month = df_posts.groupby("month").size().reset_index(name="post_count")
+    post_counts = cells["posts"][dated].groupby(cells["month_id"][dated]).sum()
+    post_counts_by_month = pd.DataFrame({
+        "month": month_ids_to_timestamps(post_counts.index),
+        "post_count": post_counts.to_numpy(),
+    })
 
     return post_counts_by_month
 
 
+@perf_monitor.track
 def get_engagement_trend_data(data):
-    engagement_data = []
-    for account in data:
-        for post in account.get("posts", []):
-            upload_date_str = post.get("upload_date")
-            likes = post.get("number_of_likes", 0) or 0
-            comments = post.get("number_of_comments", 0) or 0
-            video_view_count = post.get("video_view_count", 0) or 0
-            
-            if upload_date_str:
-                try:
-                    upload_date = datetime.strptime(upload_date_str, "%Y-%m-%d").date()
-                    total_engagement = likes + comments + video_view_count  # Sum of likes, comments, and video views
-                    engagement_data.append((upload_date, total_engagement))
-                except ValueError:
-                    pass  # skip malformed dates
+    cells = data.get_cube().posts
+    dated = cells["month_id"] != MISSING_MONTH
 
     # If no engagement data matches the filters, return an empty dataframe
-    if not engagement_data:
+    if not dated.any():
         return pd.DataFrame(columns=["month", "total_engagement"])
-        
-    # Step 2: Create DataFrame and convert the date column to datetime
-    df_engagement = pd.DataFrame(engagement_data, columns=["date", "engagement"])
-    df_engagement["date"] = pd.to_datetime(df_engagement["date"])  # Ensure 'date' column is datetime type
-
-    # Extract month-year for grouping
-    df_engagement["month"] = df_engagement["date"].dt.to_period("M").dt.to_timestamp()
 
     # Group by month and calculate total engagement for each month
-    engagement_by_month = df_engagement.groupby("month")["engagement"].sum().reset_index(name="total_engagement")
+    engagement = get_post_engagement(cells)[dated].groupby(cells["month_id"][dated]).sum()
+    engagement_by_month = pd.DataFrame({
+        "month": month_ids_to_timestamps(engagement.index),
+        "total_engagement": engagement.to_numpy(),
+    })
 
     return engagement_by_month
 
@@ -716,516 +782,1594 @@ THEME_KEYWORDS = {
 }
 
 
+# Flattened keyword vocabulary. A keyword's id is its position in this list, so
+# keywords listed under several themes (e.g. "Playground") keep one id per theme.
+ALL_KEYWORDS = [keyword for keywords in THEME_KEYWORDS.values() for keyword in keywords]
+THEME_NAMES = list(THEME_KEYWORDS.keys())
+KEYWORD_THEME_IDS = [
+    theme_id
+    for theme_id, keywords in enumerate(THEME_KEYWORDS.values())
+    for _ in keywords
+]
+KEYWORD_IDS_BY_TEXT = defaultdict(list)
+for _keyword_id, _keyword in enumerate(ALL_KEYWORDS):
+    KEYWORD_IDS_BY_TEXT[_keyword.lower()].append(_keyword_id)
+
+# Lowercase text of each keyword id, and the distinct texts as cached by the AnnotationCache
+KEYWORD_TEXTS = [keyword.lower() for keyword in ALL_KEYWORDS]
+KEYWORD_VOCABULARY = frozenset(KEYWORD_TEXTS)
+
+# Keywords x themes membership matrix; multiplying a posts x keywords incidence
+# matrix by it gives the number of matched keywords per post per theme
+KEYWORD_THEME_MATRIX = sparse.csr_matrix(
+    (np.ones(len(ALL_KEYWORDS), dtype=np.int32), (np.arange(len(ALL_KEYWORDS)), KEYWORD_THEME_IDS)),
+    shape=(len(ALL_KEYWORDS), len(THEME_NAMES)),
+)
+
+# Compiled once; finds every THEME_KEYWORDS entry in a caption in a single pass
+KEYWORD_MATCHER = KeywordMatcher(ALL_KEYWORDS)
+
+# Scorers of the fuzzy MATCH_MODEs
+FUZZY_SCORERS = {
+    "partial": fuzz.partial_ratio,
+    "token_set": fuzz.token_set_ratio,
+}
+if MATCH_MODE != "exact" and MATCH_MODE not in FUZZY_SCORERS:
+    raise ValueError(f"Unknown MATCH_MODE {MATCH_MODE!r}; expected 'exact' or one of {sorted(FUZZY_SCORERS)}")
 
+# Changes whenever THEME_KEYWORDS does, invalidating stored keyword matches
+TAXONOMY_VERSION = hashlib.sha256(
+    json.dumps(THEME_KEYWORDS, sort_keys=False).encode("utf-8")
+).hexdigest()[:16]
 
+# Sentinels for posts without a valid upload date (real date ordinals start at 1)
+MISSING_DATE = 0
+MISSING_MONTH = -1
 
 
-def get_accounts(data):
-    rows = []
-
-    for account in data:
-        username = account.get("username", "")
-        profile_url = f"https://www.instagram.com/{username}"
-
-        for post in account.get("posts", []):
-            post_url = post.get("url", "")  # Assuming each post has a `url` field
-
-            rows.append({
-                "User Name": username,
-                "Full Name": account.get("full_name", ""),
-                "Followers": account.get("followers", 0),
-                "Following": account.get("following", 0),
-                "Countries": account.get("country", ""),
-                "Post URL": post_url,  # Each post gets its own URL in a separate row
-                "Profile URL": profile_url,
-                "External URL": account.get("external_url", ""),
-            })
-    
-    # Convert the rows into a DataFrame
-    df = pd.DataFrame(rows)
-    return df
+def get_post_text(post):
+    """
+    Build the lowercased caption + hashtags blob that keywords are matched against
+    """
+    caption = post.get("caption") or ""
+    hashtags = " ".join(post.get("hashtags") or [])
+    return f"{caption} {hashtags}".lower()
 
 
-def format_number(num):
-    if num >= 1_000_000_000:
-        return f"{num / 1_000_000_000:.1f}B"
-    elif num >= 1_000_000:
-        return f"{num / 1_000_000:.1f}M"
-    elif num >= 1_000:
-        return f"{num / 1_000:.1f}K"
+def parse_upload_date(post):
+    """
+    Return the post's upload date, or None if it is missing or malformed
+    """
+    upload_date = post.get("upload_date")
+    if not upload_date:
+        return None
+    try:
+        return datetime.strptime(upload_date, "%Y-%m-%d").date()
+    except ValueError:
+        return None
+
+
+def score_keywords(text_blob, keywords, keyword_matcher):
+    """
+    Score keywords against a post text under MATCH_MODE.
+
+    Scores are floored to whole numbers to be stored as uint8, which leaves
+    `score >= threshold` unchanged for whole-number thresholds.
+
+    Args:
+        text_blob (str): Lowercased post text
+        keywords (list): Lowercase keyword texts
+        keyword_matcher (KeywordMatcher): Matcher over `keywords`, finding the ones that occur in "exact" mode
+
+    Returns:
+        dict: Index in `keywords` -> score for the matching keywords, in index order
+    """
+    if MATCH_MODE == "exact":
+        candidates = sorted(keyword_matcher.find_ids(text_blob))
+        scorer = fuzz.partial_ratio
+        score_cutoff = 0
     else:
-        return str(num)
+        candidates = range(len(keywords))
+        scorer = FUZZY_SCORERS[MATCH_MODE]
+        score_cutoff = MIN_MATCH_SCORE
 
+    keyword_scores = {}
+    for keyword_id in candidates:
+        score = scorer(keywords[keyword_id], text_blob, score_cutoff=score_cutoff)
+        if score:
+            keyword_scores[keyword_id] = int(score)
+    return keyword_scores
 
 
-def get_total_countries(data):
-    countries = set()
+def score_texts(text_blobs, keywords, keyword_matcher, threads=1):
+    """
+    Score keywords against a list of post texts under MATCH_MODE, with the same
+    results as score_keywords on each text.
 
-    for account in data:
-        country = account.get("country", "")
-        if country:
-            countries.add(country)
+    Fuzzy modes score the texts against all keywords in one rapidfuzz.process.cdist
+    call per ANNOTATION_CHUNK_SIZE texts, on `threads` threads (-1 for all cores);
+    pairs that cannot reach MIN_MATCH_SCORE are abandoned early.
 
-    return len(countries)
+    Returns:
+        list: {index in `keywords`: score} for each text
+    """
+    if MATCH_MODE == "exact" or not keywords:
+        return [score_keywords(text_blob, keywords, keyword_matcher) for text_blob in text_blobs]
+
+    text_scores = []
+    for start in range(0, len(text_blobs), ANNOTATION_CHUNK_SIZE):
+        # float32 rather than an integer dtype, which would round the scores instead of flooring them
+        scores = process.cdist(
+            text_blobs[start:start + ANNOTATION_CHUNK_SIZE],
+            keywords,
+            scorer=FUZZY_SCORERS[MATCH_MODE],
+            score_cutoff=MIN_MATCH_SCORE,
+            dtype=np.float32,
+            workers=threads,
+        )
+        rows, keyword_ids = np.nonzero(scores)
+        row_scores = np.floor(scores[rows, keyword_ids]).astype(np.int64)
+        bounds = np.searchsorted(rows, np.arange(len(scores) + 1))
+        for row_start, row_end in zip(bounds[:-1], bounds[1:]):
+            text_scores.append(dict(zip(keyword_ids[row_start:row_end].tolist(), row_scores[row_start:row_end].tolist())))
+    return text_scores
+
+
+def match_keywords(text_blob):
+    """
+    Return {keyword id: score} for every keyword matching the text.
 
+    The scores are kept so that any threshold can be applied later without
+    rescanning the text.
+    """
+    return score_keywords(text_blob, KEYWORD_TEXTS, KEYWORD_MATCHER)
 
-def get_top_accounts_by_post_count(data, top_n=10):
-    account_post_counts = []
 
-    for account in data:
-        username = account.get("username", "")
-        post_count = len(account.get("posts", []))
-        account_post_counts.append((username, post_count))
+def annotate_texts(text_blobs, threads=1):
+    """
+    Match keywords in a list of post texts. Runs in the annotation worker
+    processes, so it only takes and returns plain lists and dicts.
 
-    sorted_accounts = sorted(account_post_counts, key=lambda x: x[1], reverse=True)[:top_n]
-    
-    return pd.DataFrame(sorted_accounts, columns=["Account", "Post Count"])
+    Returns:
+        list: match_keywords result for each text
+    """
+    return score_texts(text_blobs, KEYWORD_TEXTS, KEYWORD_MATCHER, threads)
 
 
+def match_keyword_texts(text_blobs, keywords, keyword_matcher, threads=1):
+    """
+    Return {keyword: score} for the given lowercase keywords that match each text
+    """
+    return [
+        {keywords[index]: score for index, score in keyword_scores.items()}
+        for keyword_scores in score_texts(text_blobs, keywords, keyword_matcher, threads)
+    ]
 
-# Define consistent theme colors
-THEME_COLOR_MAP = {
-    theme: px.colors.qualitative.Plotly[i % len(px.colors.qualitative.Plotly)]
-    for i, theme in enumerate(THEME_KEYWORDS.keys())
-}
 
-@st.cache_data(show_spinner=False)
-def get_top_themes(data, top_n=5, threshold=60):
-    theme_counter = Counter()
+def keyword_scores_to_texts(keyword_scores):
+    """
+    Key match scores by keyword text instead of keyword id, as stored in the AnnotationCache
+    """
+    return {KEYWORD_TEXTS[keyword_id]: score for keyword_id, score in keyword_scores.items()}
 
-    for account in data:
-        for post in account.get("posts", []):
-            caption = post.get("caption", "")
-            hashtags = " ".join(post.get("hashtags", []))
-            text_blob = f"{caption} {hashtags}".lower()
 
+def keyword_scores_from_texts(text_scores):
+    """
+    Map scores keyed by keyword text back to the current keyword ids, dropping
+    keywords that are no longer in THEME_KEYWORDS
+    """
+    if not text_scores:
+        return {}
+    keyword_scores = {
+        keyword_id: score
+        for keyword, score in text_scores.items()
+        for keyword_id in KEYWORD_IDS_BY_TEXT.get(keyword, ())
+    }
+    return dict(sorted(keyword_scores.items()))
 
-            for theme, keywords in THEME_KEYWORDS.items():
-                if any(keyword.lower() in text_blob and fuzz.partial_ratio(keyword.lower(), text_blob) >= threshold for keyword in keywords):
-                    theme_counter[theme] += 1
 
-    top_themes = theme_counter.most_common(top_n)
-    return pd.DataFrame(top_themes, columns=["Theme", "Post Count"])
+def month_id_to_label(month_id):
+    """
+    Convert a month id (year * 12 + month - 1) to a "YYYY-MM" label
+    """
+    return f"{month_id // 12:04d}-{month_id % 12 + 1:02d}"
 
-@st.cache_data(show_spinner=False)
-def get_theme_distribution(data, threshold=60):
-    theme_counter = Counter()
 
-    for account in data:
-        for post in account.get("posts", []):
-            caption = post.get("caption", "")
-            hashtags = " ".join(post.get("hashtags", []))
-            text_blob = f"{caption} {hashtags}".lower()
+def date_to_month_id(day):
+    return day.year * 12 + day.month - 1
 
-            for theme, keywords in THEME_KEYWORDS.items():
-                if any(keyword.lower() in text_blob and fuzz.partial_ratio(keyword.lower(), text_blob) >= threshold for keyword in keywords):
-                    theme_counter[theme] += 1
 
-    return pd.DataFrame(theme_counter.items(), columns=["Theme", "Post Count"])
+def month_id_to_date(month_id):
+    """
+    First day of the month with the given id
+    """
+    return date(month_id // 12, month_id % 12 + 1, 1)
 
-@st.cache_data(show_spinner=False)
-def get_theme_trend_over_time(data, _top_themes, threshold=60):
-    theme_monthly_counts = defaultdict(lambda: defaultdict(int))
 
-    for account in data:
-        for post in account.get("posts", []):
-            caption = post.get("caption", "")
-            hashtags = " ".join(post.get("hashtags", []))
-            text_blob = f"{caption} {hashtags}".lower()
-            upload_date = post.get("upload_date")
+def month_ids_to_timestamps(month_ids):
+    """
+    Convert month ids to the timestamps of the first day of each month
+    """
+    month_ids = np.asarray(month_ids, dtype=np.int64)
+    return pd.to_datetime(pd.DataFrame({"year": month_ids // 12, "month": month_ids % 12 + 1, "day": 1}))
 
-            if not upload_date:
-                continue
 
-            try:
-                month = datetime.strptime(upload_date, "%Y-%m-%d").strftime("%Y-%m")
-            except ValueError:
-                continue
+class PostingLists:
+    """
+    Sorted post rows for each value of a filter dimension, in CSR layout: the
+    rows having value i are rows[indptr[i]:indptr[i + 1]], optionally with a
+    match score for each of them in scores
+    """
 
-            for theme in _top_themes:
-                keywords = THEME_KEYWORDS.get(theme, [])
-                if any(keyword.lower() in text_blob and fuzz.partial_ratio(keyword.lower(), text_blob) >= threshold for keyword in keywords):
-                    theme_monthly_counts[theme][month] += 1
+    def __init__(self, indptr, rows, scores=None):
+        self.indptr = indptr
+        self.rows = rows
+        self.scores = scores
+
+    def __reduce__(self):
+        return (PostingLists, (self.indptr, self.rows, self.scores))
+
+    @classmethod
+    def from_codes(cls, codes, n_values):
+        """
+        Build from one value code per post row; negative codes mean no value
+        """
+        codes = np.asarray(codes)
+        rows = np.flatnonzero(codes >= 0)
+        rows = rows[np.argsort(codes[rows], kind="stable")]
+        counts = np.bincount(codes[rows], minlength=n_values)
+        return cls(np.concatenate(([0], np.cumsum(counts))), rows.astype(np.int32))
+
+    @classmethod
+    def from_matrix(cls, matrix):
+        """
+        Build from a posts x values sparse matrix, keeping its entries as the scores
+        """
+        matrix = matrix.tocsc()
+        matrix.sort_indices()
+        return cls(matrix.indptr, matrix.indices, matrix.data)
+
+    def bitmap(self, values, n_rows, min_score=None):
+        """
+        Union of the posting lists of the given values, as a boolean mask over the post rows.
+        With min_score, only the rows scoring at least that much are included.
+        """
+        mask = np.zeros(n_rows, dtype=bool)
+        for value in values:
+            start, end = self.indptr[value], self.indptr[value + 1]
+            rows = self.rows[start:end]
+            if min_score is not None:
+                rows = rows[self.scores[start:end] >= min_score]
+            mask[rows] = True
+        return mask
+
+
+class PostIndex:
+    """
+    Indexes built once per loaded store so filter_data never rescans posts or captions:
+    posting lists from account, country and keyword (with the match scores) to post
+    rows, the best keyword match score of every post, and the dated post rows in
+    upload date order for range lookups. Themes are resolved through their keywords,
+    so every lookup can apply any match score threshold.
+    """
+
+    def __init__(self, accounts, countries, keywords, max_scores, date_rows, sorted_dates):
+        self.accounts = accounts
+        self.countries = countries
+        self.keywords = keywords
+        self.max_scores = max_scores
+        self.date_rows = date_rows
+        self.sorted_dates = sorted_dates
+
+    def __reduce__(self):
+        return (PostIndex, (
+            self.accounts,
+            self.countries,
+            self.keywords,
+            self.max_scores,
+            self.date_rows,
+            self.sorted_dates,
+        ))
+
+    @classmethod
+    def build(cls, store):
+        posts = store.posts
+        date_ordinals = posts["date_ordinal"].to_numpy()
+        date_rows = np.flatnonzero(date_ordinals != MISSING_DATE)
+        date_rows = date_rows[np.argsort(date_ordinals[date_rows], kind="stable")]
+        return cls(
+            PostingLists.from_codes(posts["account_code"].to_numpy(), len(store.accounts)),
+            PostingLists.from_codes(posts["country_code"].to_numpy(), len(store.countries)),
+            PostingLists.from_matrix(store.keyword_scores),
+            # 0 for posts without any match
+            store.keyword_scores.max(axis=1).toarray().ravel(),
+            date_rows.astype(np.int32),
+            date_ordinals[date_rows],
+        )
+
+    def date_range_rows(self, start_ordinal, end_ordinal):
+        """
+        Post rows uploaded between the two date ordinals (inclusive), found by binary search
+        """
+        start = np.searchsorted(self.sorted_dates, start_ordinal, side="left")
+        end = np.searchsorted(self.sorted_dates, end_ordinal, side="right")
+        return self.date_rows[start:end]
+
+
+class PostCube:
+    """
+    Post metrics pre-aggregated per (month, country, account) cell, with the posts
+    of each cell also counted per theme and per keyword at one score threshold.
 
-    records = []
-    for theme, monthly_data in theme_monthly_counts.items():
-        for month, count in monthly_data.items():
-            records.append({"Theme": theme, "Month": month, "Post Count": count})
+    Every cell keeps the first post row it covers, so entities rolled up from the
+    cells keep the order a scan over the posts would first encounter them in.
 
-    df = pd.DataFrame(records)
-    df["Month"] = pd.to_datetime(df["Month"])
-    return df.sort_values("Month")
+    Attributes:
+        posts (pd.DataFrame): month_id, country_code, account_code -> posts, likes,
+            comments, views, followers, first_row
+        themes (pd.DataFrame): month_id, country_code, account_code, theme_id -> posts, first_row
+        keywords (pd.DataFrame): month_id, country_code, account_code, keyword_id -> posts, first_row
+    """
+
+    DIMENSIONS = ["month_id", "country_code", "account_code"]
+
+    def __init__(self, posts, themes, keywords):
+        self.posts = posts
+        self.themes = themes
+        self.keywords = keywords
+
+    def __reduce__(self):
+        return (PostCube, (self.posts, self.themes, self.keywords))
+
+    @classmethod
+    def build(cls, data, threshold=60):
+        """
+        Aggregate the cube from the posts of a PostStore or PostSelection, keeping
+        their rows in the store as first rows
+        """
+        rows = data.rows
+        posts = pd.DataFrame({
+            column: data.column(column) for column in cls.DIMENSIONS + ["likes", "comments", "views", "followers"]
+        })
+        post_cells = posts.assign(row=rows).groupby(cls.DIMENSIONS, sort=True).agg(
+            posts=("row", "size"),
+            likes=("likes", "sum"),
+            comments=("comments", "sum"),
+            views=("views", "sum"),
+            followers=("followers", "sum"),
+            first_row=("row", "min"),
+        ).reset_index()
+
+        return cls(
+            post_cells,
+            cls._entity_cells(posts, rows, data.theme_matrix(threshold), "theme_id"),
+            cls._entity_cells(posts, rows, data.keyword_matrix(threshold), "keyword_id"),
+        )
+
+    @classmethod
+    def _entity_cells(cls, posts, rows, matrix, entity_column):
+        coo = matrix.tocoo()
+        cells = pd.DataFrame({column: posts[column].to_numpy()[coo.row] for column in cls.DIMENSIONS})
+        cells[entity_column] = coo.col.astype(np.int32)
+        cells["row"] = rows[coo.row].astype(np.int64)
+        return cells.groupby(cls.DIMENSIONS + [entity_column], sort=True).agg(
+            posts=("row", "size"),
+            first_row=("row", "min"),
+        ).reset_index()
+
+    def select(self, account_codes=None, country_codes=None, month_range=None):
+        """
+        Return the cube restricted to the given accounts, countries and (first, last)
+        month ids. Cells keep their first rows, which still order them as the rows of
+        the matching PostSelection do.
+        """
+        def restrict(cells):
+            mask = np.ones(len(cells), dtype=bool)
+            if account_codes is not None:
+                mask &= np.isin(cells["account_code"].to_numpy(), account_codes)
+            if country_codes is not None:
+                mask &= np.isin(cells["country_code"].to_numpy(), country_codes)
+            if month_range is not None:
+                month_ids = cells["month_id"].to_numpy()
+                mask &= (month_ids >= month_range[0]) & (month_ids <= month_range[1])
+            return cells[mask].reset_index(drop=True)
+
+        return PostCube(restrict(self.posts), restrict(self.themes), restrict(self.keywords))
+
+    def _entity_cells_for(self, entity_column):
+        return self.themes if entity_column == "theme_id" else self.keywords
+
+    def entity_totals(self, entity_column):
+        """
+        Post counts per theme_id or keyword_id, in first-seen order
+
+        Returns:
+            pd.Series: Entity id -> post count, for the entities that occur at all
+        """
+        totals = self._entity_cells_for(entity_column).groupby(entity_column).agg(
+            posts=("posts", "sum"),
+            first_row=("first_row", "min"),
+        )
+        # Entities first seen in the same post stay in id order
+        return totals.sort_values("first_row", kind="stable")["posts"]
+
+    def monthly_counts(self, entity_column, columns=None):
+        """
+        Count dated posts per month per theme_id or keyword_id
+
+        Args:
+            entity_column (str): "theme_id" or "keyword_id"
+            columns (list): Restrict to these entity ids; entities first seen in the same post keep this order
+
+        Returns:
+            pd.DataFrame: Months ("YYYY-MM", ascending) x entity ids, columns in first-seen order
+        """
+        month_ids = self.posts["month_id"].to_numpy()
+        month_ids = np.unique(month_ids[month_ids != MISSING_MONTH])
+
+        cells = self._entity_cells_for(entity_column)
+        cells = cells[cells["month_id"].to_numpy() != MISSING_MONTH]
+        first_rows = cells.groupby(entity_column)["first_row"].min()
+
+        if columns is None:
+            order = first_rows.sort_values(kind="stable").index.to_numpy()
+        else:
+            columns = np.asarray(columns, dtype=np.int64)
+            column_first_rows = first_rows.reindex(columns).to_numpy()
+            seen = ~np.isnan(column_first_rows)
+            order = columns[seen][np.argsort(column_first_rows[seen], kind="stable")]
+
+        counts = cells.groupby(["month_id", entity_column])["posts"].sum().unstack(fill_value=0)
+        counts = counts.reindex(index=month_ids, columns=order, fill_value=0).to_numpy(dtype=np.int64)
+        return pd.DataFrame(counts, index=[month_id_to_label(month_id) for month_id in month_ids], columns=order)
+
+
+class PostStore:
+    """
+    Columnar, annotated form of translated_output.json with one row per post.
+
+    Attributes:
+        posts (pd.DataFrame): One row per post: account_code, country_code, date_ordinal,
+            month_id, likes, comments, views, followers, url and the lowercased text blob
+        accounts (pd.DataFrame): Account attributes, indexed by account code
+        countries (list): Country names, indexed by country code
+        keyword_scores (sparse.csr_matrix): Posts x ALL_KEYWORDS matrix holding the
+            match score of every keyword matched in a post, as scored by MATCH_MODE:
+            100 for exact hits, or the fuzz.partial_ratio / fuzz.token_set_ratio score
+            (at least MIN_MATCH_SCORE)
+        account_ids (np.ndarray): Codes of the accounts included in this store
+        version (str): Identifies the store's contents; st.cache_data hashes stores by
+            this id alone (see STORE_HASH_FUNCS) instead of by their contents
+        cubes (OrderedDict): Keyword score threshold -> PostCube, built on first use and
+            least recently used first; at most CUBE_CACHE_SIZE are kept
+
+    The store returned by get_data is shared by every session, so it is never
+    modified after loading except to add the index, cubes and engine built on
+    first use. Each of those is built once, outside the store's lock and under a
+    lock of its own, so building one (such as a cube for a new threshold) never
+    holds up sessions reading the others.
+    """
 
+    def __init__(self, posts, accounts, countries, keyword_scores, account_ids=None, index=None, version=None,
+                 cubes=None):
+        if isinstance(keyword_scores, tuple):
+            # (data, indices, indptr, shape), as produced by __reduce__
+            keyword_scores = sparse.csr_matrix(keyword_scores[:3], shape=keyword_scores[3])
+
+        self.posts = posts
+        self.accounts = accounts
+        self.countries = countries
+        self.keyword_scores = keyword_scores
+        self.account_ids = np.arange(len(accounts)) if account_ids is None else account_ids
+        self.index = index
+        # Without a known source, a store only ever matches itself
+        self.version = uuid.uuid4().hex if version is None else version
+        self.cubes = OrderedDict(cubes or ())
+        self.engine = None
+        # Guards cubes and _build_locks only, and is never held while building
+        self._lock = threading.Lock()
+        # "index", "engine" or ("cube", threshold) -> lock held while building it
+        self._build_locks = {}
+
+    def __len__(self):
+        return len(self.posts)
+
+    def __reduce__(self):
+        # Used for pickling, so the sparse matrix is passed as its plain CSR arrays.
+        # st.cache_data hashes stores by version instead (see STORE_HASH_FUNCS).
+        keyword_scores = self.keyword_scores
+        return (PostStore, (
+            self.posts,
+            self.accounts,
+            self.countries,
+            (keyword_scores.data, keyword_scores.indices, keyword_scores.indptr, keyword_scores.shape),
+            self.account_ids,
+            self.index,
+            self.version,
+            # The DuckDB engine is left out; a copy loads its own from its posts
+            self.cubes,
+        ))
+
+    def _build_lock(self, key):
+        with self._lock:
+            return self._build_locks.setdefault(key, threading.Lock())
+
+    def get_index(self):
+        """
+        Return the store's PostIndex, building it on first use. get_data builds it
+        before the store is shared, so sessions read it without taking any lock.
+        """
+        if self.index is None:
+            with self._build_lock("index"):
+                if self.index is None:
+                    self.index = PostIndex.build(self)
+        return self.index
+
+    def get_engine(self):
+        """
+        Return the store's DuckDBEngine, loading its tables on first use
+        """
+        if self.engine is None:
+            with self._build_lock("engine"):
+                if self.engine is None:
+                    self.engine = DuckDBEngine(self.posts, self.keyword_scores, KEYWORD_THEME_IDS)
+        return self.engine
+
+    @property
+    def rows(self):
+        """
+        Every post row, as PostSelection.rows
+        """
+        return np.arange(len(self.posts))
+
+    def column(self, name, rows=None):
+        """
+        Values of a posts column, for every post or for the given rows
+        """
+        if rows is None:
+            return self.posts[name].to_numpy()
+        # Gathered before converting, so string columns only convert the rows taken
+        return self.posts[name].array.take(rows).to_numpy()
+
+    def get_cube(self, threshold=60):
+        """
+        Return the store's PostCube at a keyword score threshold, building it on first use.
+        The store is shared by every session, so only the cubes of the CUBE_CACHE_SIZE
+        most recently used thresholds are kept.
+
+        A missing cube is built under a lock for its threshold alone, so sessions
+        using other thresholds, or filtering, are not held up by the build.
+        """
+        with self._lock:
+            cube = self.cubes.get(threshold)
+            if cube is not None:
+                self.cubes.move_to_end(threshold)
+                return cube
+
+        with self._build_lock(("cube", threshold)):
+            # Another session may have built it while this one waited
+            with self._lock:
+                cube = self.cubes.get(threshold)
+            if cube is None:
+                if QUERY_ENGINE == "duckdb":
+                    cube = PostCube(*self.get_engine().cube_tables(threshold))
+                else:
+                    cube = PostCube.build(self, threshold)
+                with self._lock:
+                    self.cubes[threshold] = cube
+                    while len(self.cubes) > CUBE_CACHE_SIZE:
+                        self.cubes.popitem(last=False)
+        return cube
+
+    def keyword_matrix(self, threshold=60, rows=None):
+        """
+        Posts x keywords 0/1 incidence matrix of the matches scoring at least `threshold`,
+        for every post or for the given rows
+        """
+        scores = self.keyword_scores if rows is None else self.keyword_scores[rows]
+        matrix = sparse.csr_matrix(
+            ((scores.data >= threshold).astype(np.int32), scores.indices, scores.indptr),
+            shape=scores.shape,
+            # eliminate_zeros rewrites indices/indptr in place, which must not be the store's own
+            copy=True,
+        )
+        matrix.eliminate_zeros()
+        return matrix
+
+    def theme_matrix(self, threshold=60, rows=None):
+        """
+        Posts x themes 0/1 matrix; a post mentions a theme if any of its keywords matched
+        """
+        matrix = (self.keyword_matrix(threshold, rows) @ KEYWORD_THEME_MATRIX).tocsr()
+        matrix.data[:] = 1
+        return matrix
+
+
+class PostSelection:
+    """
+    The posts of a PostStore that match a filter, as their rows in the store and
+    the accounts that own them. The store's columns are shared, not copied: the
+    get_* functions accept a selection wherever they accept a store and read the
+    columns they need for the selected rows only.
+
+    Attributes:
+        store (PostStore): Store the rows refer to
+        rows (np.ndarray): Selected post rows of the store, ascending
+        account_ids (np.ndarray): Codes of the accounts owning the selected posts
+        version (str): Identifies the selection; st.cache_data hashes selections by
+            this id alone (see STORE_HASH_FUNCS), like stores
+        cube_selection (dict): PostCube.select arguments picking out the same posts, when
+            the rows are exactly some accounts, countries and whole months
+        cubes (dict): Keyword score threshold -> PostCube, built on first use
+    """
 
+    def __init__(self, store, rows, version=None, cube_selection=None):
+        self.store = store
+        self.rows = np.asarray(rows, dtype=np.int64)
+        account_post_counts = np.bincount(store.column("account_code", self.rows), minlength=len(store.accounts))
+        self.account_ids = np.flatnonzero(account_post_counts)
+        if version is None:
+            version = f"{store.version}/{hashlib.sha256(self.rows.tobytes()).hexdigest()[:16]}"
+        self.version = version
+        self.cube_selection = cube_selection
+        self.cubes = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __reduce__(self):
+        return (PostSelection, (self.store, self.rows, self.version, self.cube_selection))
+
+    @property
+    def accounts(self):
+        return self.store.accounts
+
+    @property
+    def countries(self):
+        return self.store.countries
+
+    def column(self, name, rows=None):
+        """
+        Values of a posts column for the selected posts, or for the given positions among them
+        """
+        return self.store.column(name, self.rows if rows is None else self.rows[rows])
+
+    def keyword_matrix(self, threshold=60):
+        return self.store.keyword_matrix(threshold, self.rows)
+
+    def theme_matrix(self, threshold=60):
+        return self.store.theme_matrix(threshold, self.rows)
+
+    def get_cube(self, threshold=60):
+        """
+        Return the selection's PostCube at a keyword score threshold, building it on
+        first use. With a cube selection, the store's cube is rolled up instead of
+        aggregating the selected posts.
+        """
+        with self._lock:
+            if threshold not in self.cubes:
+                if self.cube_selection is not None:
+                    self.cubes[threshold] = self.store.get_cube(threshold).select(**self.cube_selection)
+                elif QUERY_ENGINE == "duckdb":
+                    self.cubes[threshold] = PostCube(*self.store.get_engine().cube_tables(threshold, self.rows))
+                else:
+                    self.cubes[threshold] = PostCube.build(self, threshold)
+            return self.cubes[threshold]
 
 
-@st.cache_data(show_spinner=True)
-def get_top_growing_themes(data, top_n=5, threshold=60):
+def get_store_version(store):
+    return store.version
+
+
+# Passed to st.cache_data so PostStore and PostSelection arguments are hashed by their version id in O(1)
+STORE_HASH_FUNCS = {PostStore: get_store_version, PostSelection: get_store_version}
+
+
+class PostStoreBuilder:
     """
-    Calculate growth trends for themes and return top growing themes
+    Accumulates accounts and posts into PostStore columns.
+
+    Posts are buffered as Python values and compacted into typed NumPy chunks
+    every `batch_size` posts, so the raw post dicts can be discarded as soon as
+    they have been added. Keywords are matched per batch, split into chunks of
+    `chunk_size` posts across `workers` processes when there is more than one,
+    and looked up in / saved to `annotation_cache` when one is given.
+
+    Use as a context manager so the worker processes are shut down:
+
+        with PostStoreBuilder() as builder:
+            ...
+            store = builder.build()
     """
-    theme_monthly_counts = defaultdict(lambda: defaultdict(int))
 
-    # Collect monthly data for all themes
-    for account in data:
-        for post in account.get("posts", []):
-            caption = post.get("caption", "")
-            hashtags = " ".join(post.get("hashtags", []))
-            text_blob = f"{caption} {hashtags}".lower()
-            upload_date = post.get("upload_date")
+    POST_COLUMN_DTYPES = {
+        "account_code": np.int32,
+        "date_ordinal": np.int32,
+        "month_id": np.int32,
+        "likes": np.int64,
+        "comments": np.int64,
+        "views": np.int64,
+        "url": object,
+        "text": object,
+    }
 
-            if not upload_date:
+    def __init__(self, batch_size=INGEST_BATCH_SIZE, workers=ANNOTATION_WORKERS, chunk_size=ANNOTATION_CHUNK_SIZE,
+                 annotation_cache=None):
+        self.batch_size = batch_size
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.annotation_cache = annotation_cache
+        # Scanned keywords of a cached text -> (keywords it has not been scanned for
+        # and their matcher, or None, and the keywords it is scanned for after that)
+        self._new_keyword_matchers = {}
+        self._pool = None
+        self._pending = 0
+        self.accounts = []
+        self.countries = {}
+        self._columns = defaultdict(list)
+        self._keyword_counts = []
+        self._keyword_ids = []
+        self._keyword_scores = []
+        self._chunks = defaultdict(list)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def add_account(self, account=None):
+        """
+        Register an account and return its account code. The attributes can be
+        given later with set_account, e.g. when they follow the posts in the file.
+        """
+        self.accounts.append(None)
+        account_code = len(self.accounts) - 1
+        if account is not None:
+            self.set_account(account_code, account)
+        return account_code
+
+    def set_account(self, account_code, account):
+        country = account.get("country", "")
+        if country:
+            self.countries.setdefault(country, len(self.countries))
+        self.accounts[account_code] = {
+            "username": account.get("username", ""),
+            "full_name": account.get("full_name", ""),
+            "followers": account.get("followers", 0),
+            "following": account.get("following", 0),
+            "country": country,
+            "external_url": account.get("external_url", ""),
+        }
+
+    def add_post(self, account_code, post):
+        text_blob = get_post_text(post)
+        upload_date = parse_upload_date(post)
+
+        columns = self._columns
+        columns["account_code"].append(account_code)
+        columns["date_ordinal"].append(upload_date.toordinal() if upload_date else MISSING_DATE)
+        columns["month_id"].append(date_to_month_id(upload_date) if upload_date else MISSING_MONTH)
+        columns["likes"].append(post.get("number_of_likes", 0) or 0)
+        columns["comments"].append(post.get("number_of_comments", 0) or 0)
+        columns["views"].append(post.get("video_view_count", 0) or 0)
+        columns["url"].append(post.get("url", ""))
+        columns["text"].append(text_blob)
+
+        self._pending += 1
+        if self._pending >= self.batch_size:
+            self.flush()
+
+    def _match(self, text_blobs):
+        """
+        Match keywords for a list of texts, in order. Chunks are mapped over the
+        process pool and merged in submission order, so the result is the same as
+        matching the whole list in-process. The workers are spawned, because forking
+        the multithreaded Streamlit server can copy locks held by its other threads.
+        """
+        if self.workers <= 1 or len(text_blobs) <= self.chunk_size:
+            return annotate_texts(text_blobs, threads=MATCH_THREADS)
+
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+        chunks = [text_blobs[start:start + self.chunk_size] for start in range(0, len(text_blobs), self.chunk_size)]
+        return [keyword_scores for chunk_scores in self._pool.map(annotate_texts, chunks) for keyword_scores in chunk_scores]
+
+    def _annotate_cached(self, text_blobs):
+        """
+        Match keywords for a list of texts through the annotation cache: new texts
+        are matched in full, cached texts only for keywords added since they were scanned.
+        The cache only saves work, so if it cannot be read (for example while another
+        process writes to it) the texts are matched without it, and if it cannot be
+        written the matches are still returned.
+        """
+        cache = self.annotation_cache
+        text_hashes = [cache.hash_text(text_blob) for text_blob in text_blobs]
+        try:
+            cached = cache.get(text_hashes)
+        except (sqlite3.Error, OSError) as e:
+            print(f"Failed to read annotation cache, matching {len(text_blobs)} posts without it: {e}")
+            return self._match(text_blobs)
+
+        uncached_rows = [row for row, text_hash in enumerate(text_hashes) if text_hash not in cached]
+        batch_scores = [None] * len(text_blobs)
+        for row, keyword_scores in zip(uncached_rows, self._match([text_blobs[row] for row in uncached_rows])):
+            batch_scores[row] = keyword_scores
+        updates = [
+            (text_hashes[row], keyword_scores_to_texts(batch_scores[row]), KEYWORD_VOCABULARY)
+            for row in uncached_rows
+        ]
+
+        # Group the cached texts by the keywords they still have to be scanned for,
+        # so each group is scored in one batch
+        rescans = defaultdict(list)
+        for row, text_hash in enumerate(text_hashes):
+            if batch_scores[row] is not None:
                 continue
+            text_scores, scanned_keywords = cached[text_hash]
+            if scanned_keywords not in self._new_keyword_matchers:
+                new_keywords = KEYWORD_VOCABULARY - scanned_keywords
+                new_keywords = sorted(new_keywords)
+                self._new_keyword_matchers[scanned_keywords] = (
+                    (new_keywords, KeywordMatcher(new_keywords)) if new_keywords else None,
+                    scanned_keywords | KEYWORD_VOCABULARY,
+                )
+            if self._new_keyword_matchers[scanned_keywords][0] is None:
+                batch_scores[row] = keyword_scores_from_texts(text_scores)
+            else:
+                rescans[scanned_keywords].append(row)
+
+        for scanned_keywords, rows in rescans.items():
+            new_keyword_matcher, now_scanned_keywords = self._new_keyword_matchers[scanned_keywords]
+            new_text_scores = match_keyword_texts([text_blobs[row] for row in rows], *new_keyword_matcher, MATCH_THREADS)
+            for row, new_scores in zip(rows, new_text_scores):
+                text_hash = text_hashes[row]
+                text_scores = {**cached[text_hash][0], **new_scores}
+                updates.append((text_hash, text_scores, now_scanned_keywords))
+                batch_scores[row] = keyword_scores_from_texts(text_scores)
+
+        try:
+            cache.put(updates)
+        except (sqlite3.Error, OSError) as e:
+            print(f"Failed to update annotation cache: {e}")
+        return batch_scores
+
+    def _annotate(self, text_blobs):
+        if self.annotation_cache is None:
+            batch_scores = self._match(text_blobs)
+        else:
+            batch_scores = self._annotate_cached(text_blobs)
+
+        for keyword_scores in batch_scores:
+            self._keyword_counts.append(len(keyword_scores))
+            self._keyword_ids.extend(keyword_scores.keys())
+            self._keyword_scores.extend(keyword_scores.values())
+
+    def flush(self):
+        """
+        Match keywords for the buffered posts and compact them into typed arrays
+        """
+        if not self._pending:
+            return
+        self._annotate(self._columns["text"])
+        for name, dtype in self.POST_COLUMN_DTYPES.items():
+            self._chunks[name].append(np.asarray(self._columns[name], dtype=dtype))
+        self._chunks["keyword_counts"].append(np.asarray(self._keyword_counts, dtype=np.int64))
+        self._chunks["keyword_ids"].append(np.asarray(self._keyword_ids, dtype=np.int16))
+        self._chunks["keyword_scores"].append(np.asarray(self._keyword_scores, dtype=np.uint8))
+        self._columns = defaultdict(list)
+        self._keyword_counts = []
+        self._keyword_ids = []
+        self._keyword_scores = []
+        self._pending = 0
+
+    def _concat(self, name, dtype):
+        return np.concatenate(self._chunks[name]) if self._chunks[name] else np.empty(0, dtype=dtype)
+
+    def build(self):
+        self.flush()
+        columns = {name: self._concat(name, dtype) for name, dtype in self.POST_COLUMN_DTYPES.items()}
+
+        # Account attributes are only final once the whole account has been read
+        account_codes = columns["account_code"]
+        account_country_codes = np.asarray(
+            [self.countries[account["country"]] if account["country"] else -1 for account in self.accounts],
+            dtype=np.int32,
+        )
+        account_followers = np.asarray([account["followers"] or 0 for account in self.accounts], dtype=np.int64)
+
+        posts = pd.DataFrame({
+            "account_code": account_codes,
+            "country_code": account_country_codes[account_codes] if len(self.accounts) else np.empty(0, dtype=np.int32),
+            "date_ordinal": columns["date_ordinal"],
+            "month_id": columns["month_id"],
+            "likes": columns["likes"],
+            "comments": columns["comments"],
+            "views": columns["views"],
+            "followers": account_followers[account_codes] if len(self.accounts) else np.empty(0, dtype=np.int64),
+            "url": pd.Series(columns["url"], dtype=object),
+            "text": pd.Series(columns["text"], dtype=object),
+        })
+        accounts = pd.DataFrame(self.accounts, columns=["username", "full_name", "followers", "following", "country", "external_url"])
+
+        keyword_indptr = np.concatenate(([0], np.cumsum(self._concat("keyword_counts", np.int64))))
+        keyword_scores = sparse.csr_matrix(
+            (self._concat("keyword_scores", np.uint8), self._concat("keyword_ids", np.int16), keyword_indptr),
+            shape=(len(posts), len(ALL_KEYWORDS)),
+        )
+
+        return PostStore(posts, accounts, list(self.countries), keyword_scores)
+
+
+def build_post_store(data, annotation_cache=None):
+    """
+    Flatten the raw account/post JSON into a PostStore, matching keywords once per post
 
-            try:
-                month = datetime.strptime(upload_date, "%Y-%m-%d").strftime("%Y-%m")
-            except ValueError:
-                continue
+    Args:
+        data (list): List of account data as loaded from translated_output.json
+        annotation_cache (AnnotationCache): Optional cache of keyword matches by post text
+
+    Returns:
+        PostStore: Columnar post table with its account dimension table and keyword matches
+    """
+    with PostStoreBuilder(annotation_cache=annotation_cache) as builder:
+        for account in data:
+            account_code = builder.add_account(account)
+            for post in account.get("posts", []):
+                builder.add_post(account_code, post)
+        return builder.build()
 
-            for theme, keywords in THEME_KEYWORDS.items():
-                if any(keyword.lower() in text_blob and fuzz.partial_ratio(keyword.lower(), text_blob) >= threshold for keyword in keywords):
-                    theme_monthly_counts[theme][month] += 1
 
-    # Calculate growth rates for each theme
-    theme_growth_rates = {}
-    
-    for theme, monthly_data in theme_monthly_counts.items():
-        if len(monthly_data) < 2:  # Need at least 2 months for trend calculation
-            continue
-            
-        months = sorted(monthly_data.keys())
-        counts = [monthly_data[month] for month in months]
-        
-        # Convert months to numeric values for regression
-        month_nums = list(range(len(months)))
-        
-        if len(month_nums) >= 2 and sum(counts) > 0:  # Ensure we have data
-            # Use linear regression to calculate growth trend
-            slope, intercept, r_value, p_value, std_err = linregress(month_nums, counts)
-            
-            # Store growth rate (slope) and R-squared for filtering
-            theme_growth_rates[theme] = {
-                'growth_rate': slope,
-                'r_squared': r_value ** 2,
-                'total_posts': sum(counts)
-            }
-
-    # Filter themes with meaningful growth (more lenient criteria)
-    growing_themes = {
-        theme: data for theme, data in theme_growth_rates.items()
-        if data['growth_rate'] > 0 and data['total_posts'] >= 3
+def stream_post_store(path, batch_size=INGEST_BATCH_SIZE, annotation_cache=None):
+    """
+    Build a PostStore from a JSON data file without loading the whole document.
+
+    Accounts and posts are decoded one at a time and added straight to a
+    PostStoreBuilder, so peak memory is bounded by `batch_size` buffered posts
+    plus the finished columns, instead of the full JSON object graph.
+    """
+    with PostStoreBuilder(batch_size, annotation_cache=annotation_cache) as builder, open(path, "r", encoding='utf-8') as f:
+        reader = JSONStreamReader(f)
+        for _ in reader.iter_array():
+            account = {}
+            account_code = builder.add_account()
+            for key in reader.iter_object():
+                if key == "posts" and reader.peek() == "[":
+                    for _ in reader.iter_array():
+                        builder.add_post(account_code, reader.value())
+                else:
+                    account[key] = reader.value()
+            builder.set_account(account_code, account)
+        return builder.build()
+
+
+def get_snapshot_paths(path):
+    """
+    Return the paths of the Arrow snapshot files kept next to a JSON data file
+    """
+    base = os.path.splitext(path)[0]
+    return {
+        "meta": f"{base}.snapshot.json",
+        "posts": f"{base}.posts.arrow",
+        "accounts": f"{base}.accounts.arrow",
+        "keywords": f"{base}.keywords.arrow",
+        "annotations": f"{base}.annotations.sqlite",
     }
-    
-    # Sort by growth rate and get top N
-    top_growing = sorted(growing_themes.items(), key=lambda x: x[1]['growth_rate'], reverse=True)[:top_n]
-    
-    # Prepare data for the trend chart
-    records = []
-    for theme, _ in top_growing:
-        monthly_data = theme_monthly_counts[theme]
-        for month, count in monthly_data.items():
-            records.append({"Theme": theme, "Month": month, "Post Count": count})
-
-    if records:
-        df = pd.DataFrame(records)
-        df["Month"] = pd.to_datetime(df["Month"])
-        return df.sort_values("Month")
-    else:
-        return pd.DataFrame(columns=["Theme", "Month", "Post Count"])
 
 
-# Add this additional function to developer_data.py for the bar chart
+def get_file_hash(path):
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
 
-@st.cache_data(show_spinner=False)
-def get_theme_growth_rates(data, top_n=5, threshold=60):
+
+def _write_arrow_table(df, path):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    tmp_path = f"{path}.tmp"
+    with pa.OSFile(tmp_path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+
+
+def _read_arrow_table(path):
+    # Memory-mapped, so the Arrow table is decoded without first reading the file
+    # into memory. to_pandas then copies every column into NumPy-backed blocks,
+    # which is the one copy made, and the frame no longer needs the map.
+    with pa.memory_map(path, "r") as source:
+        return pa.ipc.open_file(source).read_all().to_pandas()
+
+
+def write_post_store_snapshot(store, paths, meta):
     """
-    Get growth rates for themes to display in a bar chart
+    Write a PostStore as Arrow IPC files; the metadata file is written last so a
+    partially written snapshot is never picked up
+    """
+    keyword_scores = store.keyword_scores.tocoo()
+    _write_arrow_table(store.posts, paths["posts"])
+    _write_arrow_table(store.accounts, paths["accounts"])
+    _write_arrow_table(
+        pd.DataFrame({
+            "row": keyword_scores.row.astype(np.int32),
+            "keyword_id": keyword_scores.col.astype(np.int16),
+            "score": keyword_scores.data.astype(np.uint8),
+        }),
+        paths["keywords"],
+    )
+    with open(f"{paths['meta']}.tmp", "w", encoding="utf-8") as f:
+        json.dump({**meta, "countries": store.countries}, f)
+    os.replace(f"{paths['meta']}.tmp", paths["meta"])
+
+
+def read_post_store_snapshot(paths, meta, version=None):
+    posts = _read_arrow_table(paths["posts"])
+    accounts = _read_arrow_table(paths["accounts"])
+    keywords = _read_arrow_table(paths["keywords"])
+    keyword_scores = sparse.csr_matrix(
+        (keywords["score"].to_numpy(), (keywords["row"].to_numpy(), keywords["keyword_id"].to_numpy())),
+        shape=(len(posts), len(ALL_KEYWORDS)),
+    )
+    return PostStore(posts, accounts, meta["countries"], keyword_scores, version=version)
+
+
+def get_dataset_version(file_hash):
     """
-    theme_monthly_counts = defaultdict(lambda: defaultdict(int))
+    Version id of a PostStore loaded from a data file: changes with the file's
+    content, THEME_KEYWORDS and how keywords are scored
+    """
+    return f"{file_hash[:16]}-{TAXONOMY_VERSION}-{MATCH_SCORER}"
 
-    # Collect monthly data for all themes
-    for account in data:
-        for post in account.get("posts", []):
-            caption = post.get("caption", "")
-            hashtags = " ".join(post.get("hashtags", []))
-            text_blob = f"{caption} {hashtags}".lower()
-            upload_date = post.get("upload_date")
 
-            if not upload_date:
-                continue
+def load_post_store(path):
+    """
+    Load the PostStore for a JSON data file, reusing its Arrow snapshot when it is current.
 
+    The snapshot is rebuilt only when the JSON file's content changes (checked by
+    mtime and size first, then by hash) or when THEME_KEYWORDS or the snapshot
+    layout changes.
+    """
+    paths = get_snapshot_paths(path)
+    stat = os.stat(path)
+    meta = {
+        "version": SNAPSHOT_VERSION,
+        "taxonomy": TAXONOMY_VERSION,
+        "scorer": MATCH_SCORER,
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+    }
+
+    try:
+        with open(paths["meta"], "r", encoding="utf-8") as f:
+            snapshot_meta = json.load(f)
+    except (OSError, ValueError):
+        snapshot_meta = None
+
+    if snapshot_meta and all(snapshot_meta.get(key) == meta[key] for key in ("version", "taxonomy", "scorer", "size")):
+        fresh = snapshot_meta.get("mtime_ns") == meta["mtime_ns"]
+        if not fresh and snapshot_meta.get("sha256") == get_file_hash(path):
+            # Touched but unchanged; record the new mtime and keep the snapshot
+            snapshot_meta["mtime_ns"] = meta["mtime_ns"]
+            with open(paths["meta"], "w", encoding="utf-8") as f:
+                json.dump(snapshot_meta, f)
+            fresh = True
+
+        if fresh:
             try:
-                month = datetime.strptime(upload_date, "%Y-%m-%d").strftime("%Y-%m")
-            except ValueError:
-                continue
+                version = get_dataset_version(snapshot_meta["sha256"])
+                store = read_post_store_snapshot(paths, snapshot_meta, version)
+                print("Loaded data from Arrow snapshot")
+                return store
+            except Exception as e:
+                print(f"Failed to load Arrow snapshot, rebuilding: {e}")
+
+    annotation_cache = None
+    if ANNOTATION_CACHE:
+        try:
+            annotation_cache = AnnotationCache(paths["annotations"], namespace=MATCH_SCORER)
+        except Exception as e:
+            print(f"Failed to open annotation cache, matching all posts: {e}")
 
-            for theme, keywords in THEME_KEYWORDS.items():
-                if any(keyword.lower() in text_blob and fuzz.partial_ratio(keyword.lower(), text_blob) >= threshold for keyword in keywords):
-                    theme_monthly_counts[theme][month] += 1
+    try:
+        if STREAMING_INGEST:
+            store = stream_post_store(path, INGEST_BATCH_SIZE, annotation_cache)
+            print("Streamed data from JSON file")
+        else:
+            with open(path, "r", encoding='utf-8') as f:
+                data = json.load(f)
+            print("Loaded data from JSON file")
+            store = build_post_store(data, annotation_cache)
+            del data
+    finally:
+        if annotation_cache is not None:
+            try:
+                annotation_cache.close()
+            except sqlite3.Error as e:
+                print(f"Failed to close annotation cache: {e}")
 
-    # Calculate growth rates for each theme
-    theme_growth_data = []
-    
-    for theme, monthly_data in theme_monthly_counts.items():
-        if len(monthly_data) < 2:
-            continue
-            
-        months = sorted(monthly_data.keys())
-        counts = [monthly_data[month] for month in months]
-        month_nums = list(range(len(months)))
-        
-        if len(month_nums) >= 2 and sum(counts) > 0:
-            slope, intercept, r_value, p_value, std_err = linregress(month_nums, counts)
-            
-            theme_growth_data.append({
-                'Theme': theme,
-                'Growth Rate': round(slope, 2),
-                'Total Posts': sum(counts),
-                'R-Squared': round(r_value ** 2, 3)
-            })
+    file_hash = get_file_hash(path)
+    store.version = get_dataset_version(file_hash)
+    try:
+        write_post_store_snapshot(store, paths, {**meta, "sha256": file_hash})
+    except Exception as e:
+        print(f"Failed to write Arrow snapshot: {e}")
 
-    # Filter and sort
-    growing_themes = [
-        item for item in theme_growth_data 
-        if item['Growth Rate'] > 0 and item['Total Posts'] >= 3
-    ]
-    
-    # Sort by growth rate and get top N
-    growing_themes = sorted(growing_themes, key=lambda x: x['Growth Rate'], reverse=True)[:top_n]
-    
-    return pd.DataFrame(growing_themes)
+    return store
 
 
 
 
 
-@st.cache_data(show_spinner=False)
-def get_top_keywords(data, top_n=10, threshold=60):
+
+# Columns of the accounts table that are attributes of the post's account, and
+# the accounts column each one is sorted and searched by
+ACCOUNT_TABLE_COLUMNS = {
+    "User Name": "username",
+    "Full Name": "full_name",
+    "Followers": "followers",
+    "Following": "following",
+    "Countries": "country",
+    "Profile URL": "username",
+    "External URL": "external_url",
+}
+
+
+def _accounts_table(data, rows):
     """
-    Get top keywords from all posts using predefined THEME_KEYWORDS
+    Accounts table for the given post rows, in that order
     """
-    keyword_counter = Counter()
+    accounts = data.accounts.iloc[data.column("account_code", rows)].reset_index(drop=True)
+
+    # One row per post, with its account's attributes alongside
+    df = pd.DataFrame({
+        "User Name": accounts["username"],
+        "Full Name": accounts["full_name"],
+        "Followers": accounts["followers"],
+        "Following": accounts["following"],
+        "Countries": accounts["country"],
+        "Post URL": data.column("url", rows),  # Each post gets its own URL in a separate row
+        "Profile URL": "https://www.instagram.com/" + accounts["username"].astype(str),
+        "External URL": accounts["external_url"],
+    })
+    return df
 
-    # Flatten all keywords from THEME_KEYWORDS
-    all_keywords = []
-    for theme, keywords in THEME_KEYWORDS.items():
-        all_keywords.extend(keywords)
 
-    for account in data:
-        for post in account.get("posts", []):
-            caption = post.get("caption", "")
-            hashtags = " ".join(post.get("hashtags", []))
-            text_blob = f"{caption} {hashtags}".lower()
+@perf_monitor.track
+def get_accounts(data):
+    if len(data) == 0:
+        return pd.DataFrame()
+    return _accounts_table(data, np.arange(len(data)))
 
-            for keyword in all_keywords:
-                if keyword.lower() in text_blob and fuzz.partial_ratio(keyword.lower(), text_blob) >= threshold:
-                    keyword_counter[keyword] += 1
 
-    top_keywords = keyword_counter.most_common(top_n)
-    return pd.DataFrame(top_keywords, columns=["Keyword", "Post Count"])
+@perf_monitor.cache_data(show_spinner=False, hash_funcs=STORE_HASH_FUNCS)
+def get_accounts_table_rows(data, sort_by=None, ascending=True, search=""):
+    """
+    Post rows of the accounts table matching a search, in sorted order, without
+    materializing the table: account columns are searched and ranked once per
+    account and mapped to the posts through their account codes.
 
-@st.cache_data(show_spinner=False)
-def get_keyword_distribution(data, top_n=15, threshold=60):
+    Args:
+        data (PostStore or PostSelection): Posts to list
+        sort_by (str): Accounts table column to sort by, or None to keep post order
+        ascending (bool): Sort order; ties and missing values keep post order, missing values last
+        search (str): Case-insensitive text to look for in the user name, full name,
+            country, profile, external and post URLs; empty matches every post
+
+    Returns:
+        np.ndarray: Positions of the posts within data
     """
-    Get keyword distribution for pie chart (top 15 to avoid overcrowding)
+    accounts = data.accounts
+    account_codes = data.column("account_code")
+    rows = np.arange(len(data), dtype=np.int32)
+
+    if search:
+        account_columns = {
+            column: accounts[column].astype("string") for column in ["username", "full_name", "country", "external_url"]
+        }
+        account_columns["profile_url"] = "https://www.instagram.com/" + account_columns["username"]
+        account_matches = np.zeros(len(accounts), dtype=bool)
+        for values in account_columns.values():
+            account_matches |= values.str.contains(search, case=False, regex=False).fillna(False).to_numpy(dtype=bool)
+        post_matches = pd.Series(data.column("url")).str.contains(search, case=False, regex=False, na=False).to_numpy(dtype=bool)
+        rows = rows[account_matches[account_codes] | post_matches]
+
+    if sort_by is not None:
+        if sort_by == "Post URL":
+            codes = pd.factorize(data.column("url", rows), sort=True)[0]
+        else:
+            # Rank the accounts, then sort the posts by their account's rank
+            account_ranks = pd.factorize(accounts[ACCOUNT_TABLE_COLUMNS[sort_by]], sort=True)[0]
+            codes = account_ranks[account_codes[rows]]
+        codes = codes.astype(np.int64)
+        missing = codes < 0
+        if not ascending:
+            codes = -codes
+        codes[missing] = np.iinfo(np.int64).max
+        rows = rows[np.argsort(codes, kind="stable")]
+
+    return rows
+
+
+@perf_monitor.track
+def get_accounts_page(data, rows, page=1, page_size=50):
     """
-    keyword_counter = Counter()
+    Materialize one page of the accounts table
 
-    # Flatten all keywords from THEME_KEYWORDS
-    all_keywords = []
-    for theme, keywords in THEME_KEYWORDS.items():
-        all_keywords.extend(keywords)
+    Args:
+        data (PostStore or PostSelection): Posts the table lists
+        rows (np.ndarray): Post positions of the whole table, from get_accounts_table_rows
+        page (int): 1-based page number
+        page_size (int): Rows per page
 
-    for account in data:
-        for post in account.get("posts", []):
-            caption = post.get("caption", "")
-            hashtags = " ".join(post.get("hashtags", []))
-            text_blob = f"{caption} {hashtags}".lower()
+    Returns:
+        pd.DataFrame: The page's rows, indexed by their 1-based position in the whole table
+    """
+    start = (page - 1) * page_size
+    page_rows = rows[start:start + page_size]
+    df = _accounts_table(data, page_rows)
+    df.index = range(start + 1, start + len(page_rows) + 1)
+    return df
 
-            for keyword in all_keywords:
-                if keyword.lower() in text_blob and fuzz.partial_ratio(keyword.lower(), text_blob) >= threshold:
-                    keyword_counter[keyword] += 1
 
-    top_keywords = keyword_counter.most_common(top_n)
-    return pd.DataFrame(top_keywords, columns=["Keyword", "Post Count"])
+def format_number(num):
+    if num >= 1_000_000_000:
+        return f"{num / 1_000_000_000:.1f}B"
+    elif num >= 1_000_000:
+        return f"{num / 1_000_000:.1f}M"
+    elif num >= 1_000:
+        return f"{num / 1_000:.1f}K"
+    else:
+        return str(num)
 
-@st.cache_data(show_spinner=False)
-def get_keyword_trend_over_time(data, _top_keywords, threshold=60):
+
+
+@perf_monitor.cache_data(show_spinner=False, hash_funcs=STORE_HASH_FUNCS)
+def get_headline_metrics(data):
     """
-    Get trend of specific keywords over time
+    Compute the six headline metric tiles together, from one set of column sums
+    over the posts. Cached per version, which for a PostSelection identifies the
+    filters it was made with.
+
+    Returns:
+        dict: total_accounts, total_countries, total_posts, total_engagements,
+            avg_post_engagement and estimated_reach
     """
-    keyword_monthly_counts = defaultdict(lambda: defaultdict(int))
+    likes, comments, views, followers = (
+        int(data.column(column).sum()) for column in ("likes", "comments", "views", "followers")
+    )
+    total_posts = len(data)
+    total_engagements = likes + comments + views
+
+    # Countries of the included accounts, by code; accounts without one get -1
+    account_country_codes = pd.Index(data.countries).get_indexer(data.accounts["country"].iloc[data.account_ids])
+
+    return {
+        "total_accounts": len(data.account_ids),
+        "total_countries": len(np.unique(account_country_codes[account_country_codes >= 0])),
+        "total_posts": total_posts,
+        "total_engagements": total_engagements,
+        "avg_post_engagement": round(total_engagements / total_posts) if total_posts > 0 else 0,
+        # The estimate is linear, so it can be taken over the summed engagement and followers
+        "estimated_reach": int(estimate_post_reach(total_engagements, followers)),
+    }
 
-    for account in data:
-        for post in account.get("posts", []):
-            caption = post.get("caption", "")
-            hashtags = " ".join(post.get("hashtags", []))
-            text_blob = f"{caption} {hashtags}".lower()
-            upload_date = post.get("upload_date")
 
-            if not upload_date:
-                continue
+@perf_monitor.track
+def get_total_countries(data):
+    return get_headline_metrics(data)["total_countries"]
 
-            try:
-                month = datetime.strptime(upload_date, "%Y-%m-%d").strftime("%Y-%m")
-            except ValueError:
-                continue
 
-            for keyword in _top_keywords:
-                if keyword.lower() in text_blob and fuzz.partial_ratio(keyword.lower(), text_blob) >= threshold:
-                    keyword_monthly_counts[keyword][month] += 1
+@perf_monitor.track
+def get_top_accounts_by_post_count(data, top_n=10):
+    post_counts = np.bincount(data.column("account_code"), minlength=len(data.accounts))[data.account_ids]
+    usernames = data.accounts["username"].to_numpy()[data.account_ids]
 
-    records = []
-    for keyword, monthly_data in keyword_monthly_counts.items():
-        for month, count in monthly_data.items():
-            records.append({"Keyword": keyword, "Month": month, "Post Count": count})
+    # Stable sort keeps the original account order among equal post counts
+    order = np.argsort(-post_counts, kind="stable")[:top_n]
+    
+    return pd.DataFrame({"Account": usernames[order], "Post Count": post_counts[order]})
 
-    if records:
-        df = pd.DataFrame(records)
-        df["Month"] = pd.to_datetime(df["Month"])
-        return df.sort_values("Month")
-    else:
-        return pd.DataFrame(columns=["Keyword", "Month", "Post Count"])
 
-@st.cache_data(show_spinner=False)
-def get_top_growing_keywords(data, top_n=5, threshold=60):
+
+# Define consistent theme colors
+THEME_COLOR_MAP = {
+    theme: px.colors.qualitative.Plotly[i % len(px.colors.qualitative.Plotly)]
+    for i, theme in enumerate(THEME_KEYWORDS.keys())
+}
+
+
+def _sum_keyword_columns(counts):
     """
-    Calculate growth trends for keywords and return top growing keywords
+    Merge keyword id columns into one column per keyword, summing keywords listed
+    under several themes, and keeping the column order
     """
-    keyword_monthly_counts = defaultdict(lambda: defaultdict(int))
+    keywords = [ALL_KEYWORDS[keyword_id] for keyword_id in counts.columns]
+    return counts.T.groupby(keywords, sort=False).sum().T
 
-    # Flatten all keywords from THEME_KEYWORDS
-    all_keywords = []
-    for theme, keywords in THEME_KEYWORDS.items():
-        all_keywords.extend(keywords)
 
-    # Collect monthly data for all keywords
-    for account in data:
-        for post in account.get("posts", []):
-            caption = post.get("caption", "")
-            hashtags = " ".join(post.get("hashtags", []))
-            text_blob = f"{caption} {hashtags}".lower()
-            upload_date = post.get("upload_date")
+@perf_monitor.track
+def count_themes(data, threshold=60):
+    """
+    Count the posts that mention each theme
+    """
+    theme_counts = data.get_cube(threshold).entity_totals("theme_id")
+    return Counter({THEME_NAMES[theme_id]: int(count) for theme_id, count in theme_counts.items()})
 
-            if not upload_date:
-                continue
 
-            try:
-                month = datetime.strptime(upload_date, "%Y-%m-%d").strftime("%Y-%m")
-            except ValueError:
-                continue
+@perf_monitor.track
+def count_keywords(data, threshold=60):
+    """
+    Count the posts that mention each keyword (once per theme the keyword is listed under)
+    """
+    keyword_counts = data.get_cube(threshold).entity_totals("keyword_id")
+    keyword_counts = _sum_keyword_columns(keyword_counts.to_frame().T)
+    return Counter({keyword: int(count) for keyword, count in keyword_counts.iloc[0].items()})
 
-            for keyword in all_keywords:
-                if keyword.lower() in text_blob and fuzz.partial_ratio(keyword.lower(), text_blob) >= threshold:
-                    keyword_monthly_counts[keyword][month] += 1
 
-    # Calculate growth rates for each keyword
-    keyword_growth_rates = {}
-    
-    for keyword, monthly_data in keyword_monthly_counts.items():
-        if len(monthly_data) < 2:  # Need at least 2 months for trend calculation
-            continue
-            
-        months = sorted(monthly_data.keys())
-        counts = [monthly_data[month] for month in months]
-        
-        # Convert months to numeric values for regression
-        month_nums = list(range(len(months)))
-        
-        if len(month_nums) >= 2 and sum(counts) > 0:  # Ensure we have data
-            # Use linear regression to calculate growth trend
-            slope, intercept, r_value, p_value, std_err = linregress(month_nums, counts)
-            
-            # Store growth rate (slope) and R-squared for filtering
-            keyword_growth_rates[keyword] = {
-                'growth_rate': slope,
-                'r_squared': r_value ** 2,
-                'total_posts': sum(counts)
-            }
-
-    # Filter keywords with meaningful growth
-    growing_keywords = {
-        keyword: data for keyword, data in keyword_growth_rates.items()
-        if data['growth_rate'] > 0 and data['total_posts'] >= 3  # Lower threshold since using predefined keywords
-    }
-    
-    # Sort by growth rate and get top N
-    top_growing = sorted(growing_keywords.items(), key=lambda x: x[1]['growth_rate'], reverse=True)[:top_n]
-    
-    # Prepare data for the trend chart
-    records = []
-    for keyword, _ in top_growing:
-        monthly_data = keyword_monthly_counts[keyword]
-        for month, count in monthly_data.items():
-            records.append({"Keyword": keyword, "Month": month, "Post Count": count})
-
-    if records:
-        df = pd.DataFrame(records)
-        df["Month"] = pd.to_datetime(df["Month"])
-        return df.sort_values("Month")
-    else:
-        return pd.DataFrame(columns=["Keyword", "Month", "Post Count"])
+@perf_monitor.track
+def get_theme_monthly_counts(data, threshold=60, themes=None):
+    """
+    Count posts per theme per month, optionally restricted to the given themes
 
-@st.cache_data(show_spinner=False)
-def get_keyword_growth_rates(data, top_n=8, threshold=60):
+    Returns:
+        pd.DataFrame: Months ("YYYY-MM") x themes post counts
     """
-    Get growth rates for keywords to display in a bar chart
+    columns = None
+    if themes is not None:
+        columns = [THEME_NAMES.index(theme) for theme in themes if theme in THEME_NAMES]
+    monthly_counts = data.get_cube(threshold).monthly_counts("theme_id", columns)
+    return monthly_counts.rename(columns=lambda theme_id: THEME_NAMES[theme_id])
+
+
+@perf_monitor.track
+def get_keyword_monthly_counts(data, threshold=60, keywords=None):
     """
-    keyword_monthly_counts = defaultdict(lambda: defaultdict(int))
+    Count posts per keyword per month, optionally restricted to the given keywords
 
-    # Flatten all keywords from THEME_KEYWORDS
-    all_keywords = []
-    for theme, keywords in THEME_KEYWORDS.items():
-        all_keywords.extend(keywords)
+    Returns:
+        pd.DataFrame: Months ("YYYY-MM") x keywords post counts; without a keyword
+        list, keywords listed under several themes are counted once per theme
+    """
+    cube = data.get_cube(threshold)
+    if keywords is None:
+        return _sum_keyword_columns(cube.monthly_counts("keyword_id"))
 
-    # Collect monthly data for all keywords
-    for account in data:
-        for post in account.get("posts", []):
-            caption = post.get("caption", "")
-            hashtags = " ".join(post.get("hashtags", []))
-            text_blob = f"{caption} {hashtags}".lower()
-            upload_date = post.get("upload_date")
+    # Every id of a keyword matches the same posts, so its first id stands in for it
+    keywords = [keyword for keyword in keywords if keyword.lower() in KEYWORD_IDS_BY_TEXT]
+    keyword_ids = [KEYWORD_IDS_BY_TEXT[keyword.lower()][0] for keyword in keywords]
+    monthly_counts = cube.monthly_counts("keyword_id", keyword_ids)
+    return monthly_counts.rename(columns=dict(zip(keyword_ids, keywords)))
 
-            if not upload_date:
-                continue
 
-            try:
-                month = datetime.strptime(upload_date, "%Y-%m-%d").strftime("%Y-%m")
-            except ValueError:
-                continue
+def fit_linear_trends(counts):
+    """
+    Fit a least-squares line to every row of a count matrix in one pass.
 
-            for keyword in all_keywords:
-                if keyword.lower() in text_blob and fuzz.partial_ratio(keyword.lower(), text_blob) >= threshold:
-                    keyword_monthly_counts[keyword][month] += 1
+    Each row is fitted over its non-zero months only, numbered 0, 1, 2, ... in
+    month order, and slope, intercept and R-squared match scipy.stats.linregress
+    on those points.
+
+    Args:
+        counts (np.ndarray): Entities x months counts
+
+    Returns:
+        tuple: (slope, intercept, r_squared, n_months) arrays with one value per
+        row; slope, intercept and r_squared are NaN for rows with fewer than 2 months
+    """
+    counts = np.asarray(counts, dtype=np.float64)
+    present = counts > 0
+    n_months = present.sum(axis=1)
+
+    # Month numbers restart at 0 on each row and skip months without posts
+    month_nums = np.cumsum(present, axis=1) - 1.0
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_mean = np.where(present, month_nums, 0.0).sum(axis=1) / n_months
+        y_mean = np.where(present, counts, 0.0).sum(axis=1) / n_months
+        dx = np.where(present, month_nums - x_mean[:, None], 0.0)
+        dy = np.where(present, counts - y_mean[:, None], 0.0)
+        ssxm = (dx * dx).sum(axis=1) * (1.0 / n_months)
+        ssym = (dy * dy).sum(axis=1) * (1.0 / n_months)
+        ssxym = (dx * dy).sum(axis=1) * (1.0 / n_months)
+
+        slope = ssxym / ssxm
+        intercept = y_mean - slope * x_mean
+        r_value = np.clip(ssxym / np.sqrt(ssxm * ssym), -1.0, 1.0)
+
+    # Same degenerate cases as linregress: a flat series has an undefined r
+    degenerate = (ssxm == 0) | (ssym == 0)
+    r_value = np.where(degenerate, np.where(ssxym == 0, np.nan, 0.0), r_value)
+
+    too_short = n_months < 2
+    slope[too_short] = np.nan
+    intercept[too_short] = np.nan
+    r_value[too_short] = np.nan
+    return slope, intercept, r_value ** 2, n_months
+
+
+@perf_monitor.track
+def get_growth_rates(monthly_counts):
+    """
+    Fit a linear trend to each entity's monthly post counts
+
+    Args:
+        monthly_counts (pd.DataFrame): Months x entities post counts
+
+    Returns:
+        pd.DataFrame: Entities with at least 2 months of data (in column order) x
+        'growth_rate', 'intercept', 'r_squared', 'total_posts'
+    """
+    counts = monthly_counts.to_numpy().T
+    slope, intercept, r_squared, n_months = fit_linear_trends(counts)
+
+    growth_rates = pd.DataFrame({
+        'growth_rate': slope,
+        'intercept': intercept,
+        'r_squared': r_squared,
+        'total_posts': counts.sum(axis=1).astype(np.int64),
+    }, index=monthly_counts.columns)
+    return growth_rates[n_months >= 2]
+
+
+def get_top_growing(growth_rates, top_n):
+    """
+    Entities with a positive trend over at least 3 posts, fastest growing first
+    """
+    growing = growth_rates[(growth_rates['growth_rate'] > 0) & (growth_rates['total_posts'] >= 3)]
+    return growing.sort_values('growth_rate', ascending=False, kind="stable").head(top_n)
 
-    # Calculate growth rates for each keyword
-    keyword_growth_data = []
-    
-    for keyword, monthly_data in keyword_monthly_counts.items():
-        if len(monthly_data) < 2:
-            continue
-            
-        months = sorted(monthly_data.keys())
-        counts = [monthly_data[month] for month in months]
-        month_nums = list(range(len(months)))
-        
-        if len(month_nums) >= 2 and sum(counts) > 0:
-            slope, intercept, r_value, p_value, std_err = linregress(month_nums, counts)
-            
-            keyword_growth_data.append({
-                'Keyword': keyword,
-                'Growth Rate': round(slope, 2),
-                'Total Posts': sum(counts),
-                'R-Squared': round(r_value ** 2, 3)
-            })
+
+def get_growth_table(growth_rates, entity_column, top_n):
+    """
+    Rounded growth rate table for the growth bar charts
+    """
+    growth_data = [
+        {
+            entity_column: entity,
+            'Growth Rate': round(growth.growth_rate, 2),
+            'Total Posts': int(growth.total_posts),
+            'R-Squared': round(growth.r_squared, 3)
+        }
+        for entity, growth in zip(growth_rates.index, growth_rates.itertuples(index=False))
+    ]
 
     # Filter and sort
-    growing_keywords = [
-        item for item in keyword_growth_data 
-        if item['Growth Rate'] > 0 and item['Total Posts'] >= 3  # Lower threshold since using predefined keywords
+    growing = [
+        item for item in growth_data
+        if item['Growth Rate'] > 0 and item['Total Posts'] >= 3
     ]
-    
+
     # Sort by growth rate and get top N
-    growing_keywords = sorted(growing_keywords, key=lambda x: x['Growth Rate'], reverse=True)[:top_n]
-    
-    return pd.DataFrame(growing_keywords)
\ No newline at end of file
+    growing = sorted(growing, key=lambda x: x['Growth Rate'], reverse=True)[:top_n]
+
+    return pd.DataFrame(growing)
+
+
+def _monthly_counts_to_df(monthly_counts, entity_column, entities=None):
+    if entities is not None:
+        monthly_counts = monthly_counts[entities]
+
+    records = monthly_counts.T.stack()
+    records = records[records > 0]
+
+    if not records.empty:
+        df = pd.DataFrame({
+            entity_column: records.index.get_level_values(0),
+            "Month": pd.to_datetime(records.index.get_level_values(1)),
+            "Post Count": records.to_numpy(),
+        })
+        return df.sort_values("Month", kind="stable")
+    else:
+        return pd.DataFrame(columns=[entity_column, "Month", "Post Count"])
+
+
+@perf_monitor.cache_data(show_spinner=False, hash_funcs=STORE_HASH_FUNCS)
+def get_top_themes(data, top_n=5, threshold=60):
+    top_themes = count_themes(data, threshold).most_common(top_n)
+    return pd.DataFrame(top_themes, columns=["Theme", "Post Count"])
+
+@perf_monitor.cache_data(show_spinner=False, hash_funcs=STORE_HASH_FUNCS)
+def get_theme_distribution(data, threshold=60):
+    theme_counter = count_themes(data, threshold)
+    return pd.DataFrame(theme_counter.items(), columns=["Theme", "Post Count"])
+
+@perf_monitor.cache_data(show_spinner=False, hash_funcs=STORE_HASH_FUNCS)
+def get_theme_trend_over_time(data, _top_themes, threshold=60):
+    theme_monthly_counts = get_theme_monthly_counts(data, threshold, themes=_top_themes)
+    return _monthly_counts_to_df(theme_monthly_counts, "Theme")
+
+
+
+
+@perf_monitor.cache_data(show_spinner=False, hash_funcs=STORE_HASH_FUNCS)
+def get_theme_growth(data, threshold=60):
+    """
+    Monthly theme counts and their fitted trends, shared by the growth chart and bar chart
+    """
+    theme_monthly_counts = get_theme_monthly_counts(data, threshold)
+    return theme_monthly_counts, get_growth_rates(theme_monthly_counts)
+
+
+@perf_monitor.cache_data(show_spinner=False, hash_funcs=STORE_HASH_FUNCS)
+def get_top_growing_themes(data, top_n=5, threshold=60):
+    """
+    Calculate growth trends for themes and return top growing themes
+    """
+    theme_monthly_counts, theme_growth_rates = get_theme_growth(data, threshold)
+    top_growing = get_top_growing(theme_growth_rates, top_n)
+
+    # Prepare data for the trend chart
+    return _monthly_counts_to_df(theme_monthly_counts, "Theme", list(top_growing.index))
+
+
+# Add this additional function to developer_data.py for the bar chart
+
+@perf_monitor.cache_data(show_spinner=False, hash_funcs=STORE_HASH_FUNCS)
+def get_theme_growth_rates(data, top_n=5, threshold=60):
+    """
+    Get growth rates for themes to display in a bar chart
+    """
+    _, theme_growth_rates = get_theme_growth(data, threshold)
+    return get_growth_table(theme_growth_rates, 'Theme', top_n)
+
+
+
+
+
+@perf_monitor.cache_data(show_spinner=False, hash_funcs=STORE_HASH_FUNCS)
+def get_top_keywords(data, top_n=10, threshold=60):
+    """
+    Get top keywords from all posts using predefined THEME_KEYWORDS
+    """
+    top_keywords = count_keywords(data, threshold).most_common(top_n)
+    return pd.DataFrame(top_keywords, columns=["Keyword", "Post Count"])
+
+@perf_monitor.cache_data(show_spinner=False, hash_funcs=STORE_HASH_FUNCS)
+def get_keyword_distribution(data, top_n=15, threshold=60):
+    """
+    Get keyword distribution for pie chart (top 15 to avoid overcrowding)
+    """
+    top_keywords = count_keywords(data, threshold).most_common(top_n)
+    return pd.DataFrame(top_keywords, columns=["Keyword", "Post Count"])
+
+@perf_monitor.cache_data(show_spinner=False, hash_funcs=STORE_HASH_FUNCS)
+def get_keyword_trend_over_time(data, _top_keywords, threshold=60):
+    """
+    Get trend of specific keywords over time
+    """
+    keyword_monthly_counts = get_keyword_monthly_counts(data, threshold, keywords=_top_keywords)
+    return _monthly_counts_to_df(keyword_monthly_counts, "Keyword")
+
+@perf_monitor.cache_data(show_spinner=False, hash_funcs=STORE_HASH_FUNCS)
+def get_keyword_growth(data, threshold=60):
+    """
+    Monthly keyword counts and their fitted trends, shared by the growth chart and bar chart
+    """
+    keyword_monthly_counts = get_keyword_monthly_counts(data, threshold)
+    return keyword_monthly_counts, get_growth_rates(keyword_monthly_counts)
+
+@perf_monitor.cache_data(show_spinner=False, hash_funcs=STORE_HASH_FUNCS)
+def get_top_growing_keywords(data, top_n=5, threshold=60):
+    """
+    Calculate growth trends for keywords and return top growing keywords
+    """
+    keyword_monthly_counts, keyword_growth_rates = get_keyword_growth(data, threshold)
+    top_growing = get_top_growing(keyword_growth_rates, top_n)
+
+    # Prepare data for the trend chart
+    return _monthly_counts_to_df(keyword_monthly_counts, "Keyword", list(top_growing.index))
+
+@perf_monitor.cache_data(show_spinner=False, hash_funcs=STORE_HASH_FUNCS)
+def get_keyword_growth_rates(data, top_n=8, threshold=60):
+    """
+    Get growth rates for keywords to display in a bar chart
+    """
+    _, keyword_growth_rates = get_keyword_growth(data, threshold)
+    return get_growth_table(keyword_growth_rates, 'Keyword', top_n)
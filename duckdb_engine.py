@@ -0,0 +1,183 @@
+import duckdb
+import numpy as np
+import pandas as pd
+
+
+class DuckDBEngine:
+    """
+    Runs post filters and aggregations as SQL over an in-process DuckDB database.
+
+    The posts, their keyword matches and the keyword -> theme mapping are copied
+    into DuckDB tables once; every query then runs on its own cursor, so a single
+    engine can be shared between Streamlit sessions.
+
+    Tables:
+        posts: row, account_code, country_code, date_ordinal, month_id, likes,
+            comments, views, followers, text
+        keyword_matches: row, keyword_id, score
+        keyword_themes: keyword_id, theme_id
+    """
+
+    POST_COLUMNS = [
+        "account_code",
+        "country_code",
+        "date_ordinal",
+        "month_id",
+        "likes",
+        "comments",
+        "views",
+        "followers",
+        "text",
+    ]
+
+    def __init__(self, posts, keyword_scores, keyword_theme_ids):
+        """
+        Args:
+            posts (pd.DataFrame): PostStore posts table
+            keyword_scores (sparse matrix): Posts x keywords match scores
+            keyword_theme_ids (list): Theme id of every keyword id
+        """
+        keyword_matches = keyword_scores.tocoo()
+        tables = {
+            "posts": posts[self.POST_COLUMNS].assign(row=np.arange(len(posts), dtype=np.int64)),
+            "keyword_matches": pd.DataFrame({
+                "row": keyword_matches.row.astype(np.int64),
+                "keyword_id": keyword_matches.col.astype(np.int32),
+                "score": keyword_matches.data.astype(np.int32),
+            }),
+            "keyword_themes": pd.DataFrame({
+                "keyword_id": np.arange(len(keyword_theme_ids), dtype=np.int32),
+                "theme_id": np.asarray(keyword_theme_ids, dtype=np.int32),
+            }),
+        }
+
+        self.connection = duckdb.connect()
+        for name, df in tables.items():
+            self.connection.register(f"{name}_df", df)
+            self.connection.execute(f"CREATE TABLE {name} AS SELECT * FROM {name}_df")
+            self.connection.unregister(f"{name}_df")
+
+    def query(self, sql, params=None, tables=None):
+        """
+        Run a query on a fresh cursor and return the result as a DataFrame.
+        tables maps names to DataFrames the query can read, visible to this cursor only.
+        """
+        cursor = self.connection.cursor()
+        try:
+            for name, df in (tables or {}).items():
+                cursor.register(name, df)
+            return cursor.execute(sql, params or []).df()
+        finally:
+            cursor.close()
+
+    def filter_rows(self, account_codes=None, country_codes=None, date_bounds=None, theme_ids=None,
+                    keyword_ids=None, other_keywords=None, threshold=0):
+        """
+        Find the post rows matching all of the given filters; None skips a filter.
+
+        Themes and keywords match posts with a score of at least `threshold`. Posts that
+        mention no theme at all pass the theme filter. other_keywords are matched as
+        lowercase substrings of the post text, alongside keyword_ids.
+
+        Returns:
+            np.ndarray: Matching post rows in ascending order
+        """
+        conditions = []
+        params = []
+
+        if account_codes is not None:
+            conditions.append("list_contains(?, p.account_code)")
+            params.append([int(code) for code in account_codes])
+
+        if country_codes is not None:
+            conditions.append("list_contains(?, p.country_code)")
+            params.append([int(code) for code in country_codes])
+
+        if date_bounds is not None:
+            conditions.append("p.date_ordinal BETWEEN ? AND ?")
+            params.extend(int(bound) for bound in date_bounds)
+
+        if theme_ids is not None:
+            conditions.append("""(
+                NOT EXISTS (SELECT 1 FROM keyword_matches k WHERE k.row = p.row AND k.score >= ?)
+                OR EXISTS (
+                    SELECT 1 FROM keyword_matches k JOIN keyword_themes t USING (keyword_id)
+                    WHERE k.row = p.row AND k.score >= ? AND list_contains(?, t.theme_id)
+                )
+            )""")
+            params.extend([int(threshold), int(threshold), [int(theme_id) for theme_id in theme_ids]])
+
+        if keyword_ids is not None or other_keywords:
+            keyword_conditions = [
+                "EXISTS (SELECT 1 FROM keyword_matches k "
+                "WHERE k.row = p.row AND k.score >= ? AND list_contains(?, k.keyword_id))"
+            ]
+            params.extend([int(threshold), [int(keyword_id) for keyword_id in keyword_ids or []]])
+            for keyword in other_keywords or []:
+                if keyword:
+                    keyword_conditions.append("contains(p.text, ?)")
+                    params.append(keyword.lower())
+            conditions.append(f"({' OR '.join(keyword_conditions)})")
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self.query(f"SELECT p.row FROM posts p {where} ORDER BY p.row", params)
+        return rows["row"].to_numpy(dtype=np.int64)
+
+    def cube_tables(self, threshold=60, rows=None):
+        """
+        Aggregate the PostCube tables: per (month, country, account) post metrics,
+        and post counts per theme and per keyword scoring at least `threshold`
+
+        Args:
+            threshold (int): Minimum keyword match score
+            rows (np.ndarray): Aggregate only these post rows; None aggregates every post
+
+        Returns:
+            tuple: (posts, themes, keywords) DataFrames in PostCube layout
+        """
+        dimensions = "p.month_id, p.country_code, p.account_code"
+        if rows is None:
+            in_selection, tables = "TRUE", None
+        else:
+            in_selection = "p.row IN (SELECT row FROM selected_rows)"
+            tables = {"selected_rows": pd.DataFrame({"row": np.asarray(rows, dtype=np.int64)})}
+
+        posts = self.query(f"""
+            SELECT {dimensions},
+                count(*) AS posts,
+                sum(p.likes)::BIGINT AS likes,
+                sum(p.comments)::BIGINT AS comments,
+                sum(p.views)::BIGINT AS views,
+                sum(p.followers)::BIGINT AS followers,
+                min(p.row) AS first_row
+            FROM posts p
+            WHERE {in_selection}
+            GROUP BY ALL
+            ORDER BY ALL
+        """, tables=tables)
+
+        # A post mentions a theme when any of the theme's keywords matches it
+        themes = self.query(f"""
+            SELECT {dimensions}, t.theme_id,
+                count(DISTINCT p.row) AS posts,
+                min(p.row) AS first_row
+            FROM keyword_matches k
+            JOIN keyword_themes t USING (keyword_id)
+            JOIN posts p USING (row)
+            WHERE k.score >= ? AND {in_selection}
+            GROUP BY ALL
+            ORDER BY {dimensions}, t.theme_id
+        """, [threshold], tables)
+
+        keywords = self.query(f"""
+            SELECT {dimensions}, k.keyword_id,
+                count(*) AS posts,
+                min(p.row) AS first_row
+            FROM keyword_matches k
+            JOIN posts p USING (row)
+            WHERE k.score >= ? AND {in_selection}
+            GROUP BY ALL
+            ORDER BY {dimensions}, k.keyword_id
+        """, [threshold], tables)
+
+        return posts, themes, keywords
@@ -0,0 +1,125 @@
+import json
+
+
+class JSONStreamReader:
+    """
+    Incremental reader for a large JSON document.
+
+    Walks arrays and objects one item at a time with `iter_array` and
+    `iter_object`, and decodes individual values with `value`, so only the
+    value currently being decoded is held in memory rather than the whole
+    document.
+
+    Example:
+        for _ in reader.iter_array():
+            for key in reader.iter_object():
+                value = reader.value()
+    """
+
+    WHITESPACE = " \t\r\n"
+    NUMBER_CHARS = "0123456789+-.eE"
+
+    def __init__(self, f, chunk_size=1 << 16):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self._decoder = json.JSONDecoder()
+        self._eof = False
+
+    def _fill(self):
+        """
+        Read the next chunk into the buffer, dropping what has been consumed.
+        Returns False at end of file.
+        """
+        if self._eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """
+        Skip whitespace and return the next character without consuming it
+        """
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in self.WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON data")
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} but found {found!r} in JSON data")
+        self.pos += 1
+
+    def value(self):
+        """
+        Decode and return the next complete JSON value
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # The value continues past the end of the buffer
+                if not self._fill():
+                    raise
+                continue
+            # A number cut off at the buffer edge (e.g. "12" of "12.5e3") may continue
+            # in the next chunk
+            if (
+                isinstance(value, (int, float))
+                and not self.buffer[end:].strip(self.NUMBER_CHARS)
+                and self._fill()
+            ):
+                continue
+            self.pos = end
+            return value
+
+    def _next_item(self, close_char):
+        """
+        Consume the separator after an item; returns False once the container is closed
+        """
+        char = self.peek()
+        self.pos += 1
+        if char == close_char:
+            return False
+        if char != ",":
+            raise ValueError(f"Expected ',' or {close_char!r} but found {char!r} in JSON data")
+        return True
+
+    def iter_array(self):
+        """
+        Step through an array; the caller must consume exactly one value per iteration
+        """
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield
+            if not self._next_item("]"):
+                return
+
+    def iter_object(self):
+        """
+        Step through an object, yielding each key; the caller must consume its value
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            if not self._next_item("}"):
+                return
@@ -0,0 +1,81 @@
+from collections import deque
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton that finds every keyword occurring in a text in one pass.
+
+    Keywords are matched case-insensitively as plain substrings, so
+    `matcher.find_ids(text)` returns exactly the ids `i` for which
+    `keywords[i].lower() in text.lower()` holds. Overlapping and nested
+    keywords (e.g. "pool" inside "pool parties") are all reported.
+    """
+
+    def __init__(self, keywords):
+        self.keywords = list(keywords)
+
+        # Trie of the lowercased keywords
+        goto = [{}]
+        outputs = [[]]
+        for keyword_id, keyword in enumerate(self.keywords):
+            keyword = keyword.lower()
+            if not keyword:
+                continue
+            state = 0
+            for char in keyword:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][char] = next_state
+                    goto.append({})
+                    outputs.append([])
+                state = next_state
+            outputs[state].append(keyword_id)
+
+        # Breadth-first pass to add failure links, folding them into a full
+        # transition table over the keyword alphabet so matching never backtracks
+        alphabet = {char for transitions in goto for char in transitions}
+        fail = [0] * len(goto)
+        transitions = [dict() for _ in goto]
+        transitions[0] = {char: goto[0].get(char, 0) for char in alphabet}
+
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            outputs[state] = outputs[state] + outputs[fail[state]]
+            fallback = transitions[fail[state]]
+            for char in alphabet:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    transitions[state][char] = fallback[char]
+                else:
+                    fail[next_state] = fallback[char]
+                    transitions[state][char] = next_state
+                    queue.append(next_state)
+
+        # Drop transitions back to the root; a missing entry means state 0
+        self._transitions = [
+            {char: next_state for char, next_state in state_transitions.items() if next_state}
+            for state_transitions in transitions
+        ]
+        self._outputs = [tuple(state_outputs) for state_outputs in outputs]
+
+    def find_ids(self, text):
+        """
+        Return the set of keyword ids that occur in the text
+        """
+        transitions = self._transitions
+        outputs = self._outputs
+        matches = set()
+        state = 0
+        for char in text.lower():
+            state = transitions[state].get(char, 0)
+            if outputs[state]:
+                matches.update(outputs[state])
+        return matches
+
+    def find(self, text):
+        """
+        Return the keywords that occur in the text, in keyword order
+        """
+        return [self.keywords[keyword_id] for keyword_id in sorted(self.find_ids(text))]
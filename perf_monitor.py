@@ -0,0 +1,242 @@
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+
+# Reruns kept in the panel's history, per session
+HISTORY_LENGTH = 20
+
+# The run recorded by the current script thread and its open records, innermost last.
+# Streamlit runs each rerun of a session's script on its own thread.
+_local = threading.local()
+
+
+def count_rows(value):
+    """
+    Number of rows (or entries) in a value passed between stages, if it has any
+    """
+    # A PostStore or PostSelection counts its posts
+    if hasattr(value, "get_cube"):
+        return len(value)
+    if isinstance(value, (pd.DataFrame, pd.Series, np.ndarray, list, dict)):
+        return len(value)
+    return None
+
+
+def _current_run():
+    return getattr(_local, "run", None)
+
+
+def start_run(page):
+    """
+    Render the opt-in sidebar toggle and, while it is on, record the timings of this
+    rerun of `page`. Call once near the top of the script, before any tracked code.
+    """
+    _local.run = None
+    _local.stack = []
+    enabled = st.sidebar.toggle(
+        "Performance panel",
+        key="perf_monitor_enabled",
+        help="Time data functions and chart blocks on every rerun and show the results in the sidebar",
+    )
+    if not enabled:
+        return
+
+    run = {
+        "page": page,
+        "started": datetime.now(),
+        "start": time.perf_counter(),
+        "seconds": None,
+        "records": [],
+    }
+    history = st.session_state.setdefault("perf_monitor_history", [])
+    history.append(run)
+    del history[:-HISTORY_LENGTH]
+    _local.run = run
+
+
+@contextmanager
+def _record(name, kind, rows_in=None):
+    run = _current_run()
+    if run is None:
+        yield {}
+        return
+
+    record = {
+        "name": name,
+        "kind": kind,
+        "depth": len(_local.stack),
+        "seconds": None,
+        "cache": None,
+        "rows_in": rows_in,
+        "rows_out": None,
+    }
+    run["records"].append(record)
+    _local.stack.append(record)
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record["seconds"] = time.perf_counter() - start
+        _local.stack.pop()
+
+
+def section(name, rows_in=None):
+    """
+    Time a block of page code, such as building and drawing a chart, as a named stage.
+    The yielded record's "rows_out" can be set to the number of rows the block produced.
+
+    Example:
+        with perf_monitor.section("Top themes chart") as record:
+            ...
+            record["rows_out"] = len(top_themes_df)
+    """
+    return _record(name, "section", rows_in)
+
+
+def track(func, cached=False):
+    """
+    Time every call of a data function while the panel is on, with the row counts
+    of its first argument and of its result
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if _current_run() is None:
+            return func(*args, **kwargs)
+        with _record(func.__name__, "function", count_rows(args[0]) if args else None) as record:
+            if cached:
+                # Turned into "miss" if the cached function's body runs
+                record["cache"] = "hit"
+            result = func(*args, **kwargs)
+            record["rows_out"] = count_rows(result)
+        return result
+
+    return wrapper
+
+
+def in_thread(func):
+    """
+    Wrap func to run on another thread, such as a thread pool worker, with the tracked
+    calls it makes recorded in the calling thread's run, nested under its open records.
+    Call on the thread whose run should be used, when handing the work over.
+    """
+    run = _current_run()
+    stack = list(getattr(_local, "stack", []))
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        _local.run = run
+        _local.stack = list(stack)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _local.run = None
+            _local.stack = []
+
+    return wrapper
+
+
+def _tracked_cache(cache_decorator):
+    """
+    Wrap a Streamlit caching decorator so that the cached function is tracked and
+    each call is recorded as answered from the cache ("hit") or computed ("miss")
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def compute(*args, **kwargs):
+            stack = getattr(_local, "stack", None)
+            if _current_run() is not None and stack:
+                stack[-1]["cache"] = "miss"
+            return func(*args, **kwargs)
+
+        cached_func = cache_decorator(compute)
+        wrapper = track(cached_func, cached=True)
+        wrapper.clear = cached_func.clear
+        return wrapper
+
+    return decorate
+
+
+def cache_data(**cache_kwargs):
+    """
+    st.cache_data, tracked with its cache hits and misses
+    """
+    return _tracked_cache(st.cache_data(**cache_kwargs))
+
+
+def cache_resource(**cache_kwargs):
+    """
+    st.cache_resource, tracked with its cache hits and misses
+    """
+    return _tracked_cache(st.cache_resource(**cache_kwargs))
+
+
+def render_panel():
+    """
+    Show this rerun's timings, the cache hit rates and the history of earlier
+    reruns in the sidebar. Call once at the end of the script.
+    """
+    run = _current_run()
+    if run is None:
+        return
+    run["seconds"] = time.perf_counter() - run["start"]
+    history = st.session_state["perf_monitor_history"]
+
+    with st.sidebar.expander("⏱️ Performance", expanded=True):
+        st.metric("This rerun", f"{run['seconds'] * 1000:,.0f} ms")
+
+        records = pd.DataFrame(run["records"], columns=["name", "kind", "depth", "seconds", "cache", "rows_in", "rows_out"])
+        if not records.empty:
+            st.caption("Stages, in call order (nested calls indented)")
+            st.dataframe(
+                pd.DataFrame({
+                    "Stage": ["· " * depth + name for depth, name in zip(records["depth"], records["name"])],
+                    "ms": records["seconds"] * 1000,
+                    "Cache": records["cache"],
+                    "Rows in": records["rows_in"].astype("Int64"),
+                    "Rows out": records["rows_out"].astype("Int64"),
+                }),
+                hide_index=True,
+                column_config={"ms": st.column_config.NumberColumn(format="%.1f")},
+            )
+
+        calls = pd.DataFrame([record for past_run in history for record in past_run["records"] if record["cache"]])
+        if not calls.empty:
+            st.caption(f"Cached functions over the last {len(history)} reruns")
+            calls_ms = (calls["seconds"] * 1000).groupby([calls["name"], calls["cache"]])
+            counts = calls_ms.size().unstack(fill_value=0).reindex(columns=["hit", "miss"], fill_value=0)
+            mean_ms = calls_ms.mean().unstack().reindex(columns=["hit", "miss"])
+            cache_stats = pd.DataFrame({
+                "Hits": counts["hit"],
+                "Misses": counts["miss"],
+                "Hit rate": counts["hit"] / (counts["hit"] + counts["miss"]),
+                "Hit ms": mean_ms["hit"],
+                "Miss ms": mean_ms["miss"],
+            })
+            st.dataframe(
+                cache_stats,
+                column_config={
+                    "Hit rate": st.column_config.NumberColumn(format="percent"),
+                    "Hit ms": st.column_config.NumberColumn(format="%.1f"),
+                    "Miss ms": st.column_config.NumberColumn(format="%.1f"),
+                },
+            )
+
+        st.caption("Rerun history")
+        st.dataframe(
+            pd.DataFrame({
+                "Started": [past_run["started"].strftime("%H:%M:%S") for past_run in history],
+                "Page": [past_run["page"] for past_run in history],
+                # Reruns that stopped early (st.stop) were never timed to the end
+                "ms": [None if past_run["seconds"] is None else past_run["seconds"] * 1000 for past_run in history],
+                "Stages": [len(past_run["records"]) for past_run in history],
+            }),
+            hide_index=True,
+            column_config={"ms": st.column_config.NumberColumn(format="%.0f")},
+        )
@@ -6,6 +6,7 @@ import pandas as pd
 import plotly.express as px
 import plotly.colors as pc
 from developer_dashboard import dashboard_developer
+import perf_monitor
 from sklearn.linear_model import LinearRegression
 import google.generativeai as genai
 import pandasai as pai
@@ -81,11 +82,12 @@ st.markdown(navbar_html, unsafe_allow_html=True)
 # Sidebar Navigation
 # ------------------------------
 page = st.sidebar.radio("📊 Select Dashboard", ["Search Trends", "Brand Led Analysis"])
+perf_monitor.start_run(page)
 
 # ------------------------------
-# Load Data Once (cached)
+# Load Data Once (shared by every session, so never modified in place)
 # ------------------------------
-@st.cache_data
+@perf_monitor.cache_resource()
 def load_data():
     df = pd.read_parquet("realestate_google_trends.parquet")
     df["date"] = pd.to_datetime(df["date"], errors="coerce")
@@ -131,11 +133,17 @@ elif page == "Search Trends":
     with col2:
         selected_country = st.selectbox("🌍 Select Country", ["All"] + countries)
 
-    filtered_df = df.copy()
-    if selected_theme != "All":
-        filtered_df = filtered_df[filtered_df["theme"] == selected_theme]
-    if selected_country != "All":
-        filtered_df = filtered_df[filtered_df["country"] == selected_country]
+    with perf_monitor.section("Filters", rows_in=len(df)) as record:
+        # Filter the shared cached frame with one mask instead of copying it first. The
+        # page never modifies filtered_df in place, and with pandas copy-on-write even
+        # the unfiltered case ("All") cannot change the cached frame.
+        mask = pd.Series(True, index=df.index)
+        if selected_theme != "All":
+            mask &= df["theme"] == selected_theme
+        if selected_country != "All":
+            mask &= df["country"] == selected_country
+        filtered_df = df if mask.all() else df[mask]
+        record["rows_out"] = len(filtered_df)
 
     if filtered_df.empty:
         st.warning("No data available for the selected filters.")
@@ -237,13 +245,13 @@ elif page == "Search Trends":
     # ------------------------------
     # THEME ANALYSIS
     # ------------------------------
-    with tab1:
+    with tab1, perf_monitor.section("Theme tab", rows_in=len(filtered_df)):
         theme_avg = filtered_df.groupby("theme", as_index=False)["value"].mean()
 
         col1, col2 = st.columns(2)
 
         # Top 5 Themes by Average Interest
-        with col1:
+        with col1, perf_monitor.section("Top themes chart"):
             top_5 = theme_avg.sort_values("value", ascending=False).head(5)
             fig = px.bar(top_5, x="theme", y="value", color="theme", 
                         title="Top 5 Themes by Average Interest",
@@ -252,7 +260,7 @@ elif page == "Search Trends":
             st.plotly_chart(fig, use_container_width=True)
 
         # Theme Distribution
-        with col2:
+        with col2, perf_monitor.section("Theme distribution chart"):
             # Prepare data sorted by value
             pie_df = theme_avg.query("value > 0").sort_values("value", ascending=False)
 
@@ -303,13 +311,13 @@ elif page == "Search Trends":
     # ------------------------------
     # KEYWORD ANALYSIS
     # ------------------------------
-    with tab2:
+    with tab2, perf_monitor.section("Sub theme tab", rows_in=len(filtered_df)):
 
         col1, col2 = st.columns(2)
 
         # Top 15 Keywords by Average Interest
         keyword_avg = filtered_df.groupby("keyword", as_index=False)["value"].mean()
-        with col1:
+        with col1, perf_monitor.section("Top sub themes chart"):
             top_keywords = keyword_avg.sort_values("value", ascending=False).head(5)
             fig = px.bar(top_keywords, x="keyword", y="value", color="keyword",
                         title="Top 5 Sub Themes by Average Interest",
@@ -318,7 +326,7 @@ elif page == "Search Trends":
             st.plotly_chart(fig, use_container_width=True)
 
         # Keyword Distribution
-        with col2:
+        with col2, perf_monitor.section("Sub theme distribution chart"):
             # Sort and take top N
             TOP_N = 15
             pie_kw_df = keyword_avg.sort_values("value", ascending=False).head(TOP_N)
@@ -415,4 +423,6 @@ elif page == "Search Trends":
         with st.expander("Suggested Questions"):
             st.write("1. what are the top 3 keywords in the last 6 months.?")
             st.write("2. What are the most searched themes in 2023?")
-            st.write("3. What are the top 3 keywords in the last 6 months for the theme 'amenities' in 'united kingdom'?")
\ No newline at end of file
+            st.write("3. What are the top 3 keywords in the last 6 months for the theme 'amenities' in 'united kingdom'?")
+
+perf_monitor.render_panel()
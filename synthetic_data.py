@@ -0,0 +1,151 @@
+import argparse
+import json
+import random
+from datetime import date, timedelta
+
+from developer_data import THEME_KEYWORDS
+
+
+# Filler vocabulary for captions, in the register of real estate marketing posts
+CAPTION_WORDS = (
+    "the a an and with in of to for your our this that at on by from is are be "
+    "luxury home homes living life new now today dream welcome discover experience "
+    "beautiful stunning elegant modern exclusive unique perfect finest premium iconic "
+    "apartment apartments villa villas residence residences tower community project "
+    "bedroom bedrooms bathroom kitchen terrace balcony garden sea city skyline downtown "
+    "family families enjoy relax live love style space spaces design designed crafted "
+    "book visit call contact details link bio offer launch available ready handover "
+    "payment plan price starting from invest investment returns booking register "
+    "minutes away located location heart vibrant peaceful serene view views sunset"
+).split()
+
+COUNTRIES = ["UAE", "UK", "USA", "India", "Saudi Arabia", "Qatar", ""]
+COUNTRY_WEIGHTS = [40, 15, 10, 10, 8, 5, 12]
+
+
+def sample_keywords(rng, keywords, keyword_weights, keyword_rate):
+    """
+    Keywords a synthetic post mentions: none with probability 1 - keyword_rate,
+    otherwise one plus a geometric number of extra mentions
+    """
+    if rng.random() >= keyword_rate:
+        return []
+    count = 1
+    while rng.random() < 0.4:
+        count += 1
+    return rng.choices(keywords, weights=keyword_weights, k=count)
+
+
+def generate_post(rng, post_id, keywords, keyword_weights, keyword_rate, start_date, n_days):
+    """
+    Build one post dict in the translated_output.json layout
+    """
+    # Caption lengths are long-tailed: most captions are a couple of sentences, some are essays
+    n_words = min(int(rng.lognormvariate(3.4, 0.7)), 400)
+    words = rng.choices(CAPTION_WORDS, k=n_words)
+    mentions = sample_keywords(rng, keywords, keyword_weights, keyword_rate)
+    hashtags = []
+    for keyword in mentions:
+        if rng.random() < 0.25:
+            hashtags.append(keyword.replace(" ", "").lower())
+        else:
+            words.insert(rng.randint(0, len(words)), rng.choice([keyword, keyword.lower(), keyword.upper()]))
+    hashtags.extend(rng.choices(["realestate", "property", "luxury", "dubai", "newlaunch", "home"], k=rng.randint(0, 4)))
+
+    r = rng.random()
+    if r < 0.02:
+        upload_date = None
+    elif r < 0.03:
+        upload_date = "not a date"
+    else:
+        upload_date = (start_date + timedelta(days=rng.randrange(n_days))).isoformat()
+
+    post = {
+        "caption": " ".join(words) if rng.random() > 0.03 else None,
+        "hashtags": hashtags,
+        "upload_date": upload_date,
+        "number_of_likes": int(rng.lognormvariate(5, 1.5)) if rng.random() > 0.05 else None,
+        "number_of_comments": int(rng.lognormvariate(2, 1.2)),
+        "video_view_count": int(rng.lognormvariate(8, 1.5)) if rng.random() < 0.4 else None,
+        "url": f"https://www.instagram.com/p/{post_id}/",
+    }
+    if rng.random() < 0.02:
+        del post["number_of_comments"]
+    return post
+
+
+def generate_accounts(n_posts, seed=0, posts_per_account=50, keyword_rate=0.6, start_date=date(2022, 1, 1),
+                      n_days=3 * 365):
+    """
+    Yield synthetic account dicts (with their posts) until n_posts posts have been generated
+
+    Args:
+        n_posts (int): Total number of posts
+        seed (int): Random seed; the same arguments always generate the same accounts
+        posts_per_account (int): Mean number of posts per account
+        keyword_rate (float): Share of posts mentioning at least one THEME_KEYWORDS keyword
+        start_date (date): First possible upload date
+        n_days (int): Number of days upload dates are spread over
+
+    Yields:
+        dict: Account in the translated_output.json layout
+    """
+    rng = random.Random(seed)
+    keywords = [keyword for theme_keywords in THEME_KEYWORDS.values() for keyword in theme_keywords]
+    # A few keywords account for most mentions, as in real captions
+    keyword_weights = [1 / (rank + 1) for rank in range(len(keywords))]
+    rng.shuffle(keyword_weights)
+
+    generated = 0
+    account_id = 0
+    while generated < n_posts:
+        n_account_posts = min(int(rng.expovariate(1 / posts_per_account)), n_posts - generated)
+        posts = [
+            generate_post(rng, generated + i, keywords, keyword_weights, keyword_rate, start_date, n_days)
+            for i in range(n_account_posts)
+        ]
+        generated += n_account_posts
+        yield {
+            "username": f"developer_{account_id}",
+            "full_name": f"Developer {account_id}",
+            "followers": int(rng.lognormvariate(9, 2)),
+            "following": rng.randint(0, 2000),
+            "country": rng.choices(COUNTRIES, weights=COUNTRY_WEIGHTS)[0],
+            "external_url": f"https://developer{account_id}.example.com",
+            "posts": posts,
+        }
+        account_id += 1
+
+
+def write_dataset(path, n_posts, **kwargs):
+    """
+    Write a synthetic translated_output.json-shaped file with n_posts posts,
+    one account at a time so memory stays flat at any size
+
+    Args:
+        path (str): Output file
+        n_posts (int): Total number of posts
+        **kwargs: Passed to generate_accounts
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[")
+        for i, account in enumerate(generate_accounts(n_posts, **kwargs)):
+            if i:
+                f.write(",\n")
+            json.dump(account, f, ensure_ascii=False)
+        f.write("]\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic translated_output.json-shaped data")
+    parser.add_argument("n_posts", type=int, help="Number of posts to generate")
+    parser.add_argument("--output", default="translated_output.json")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--posts-per-account", type=int, default=50)
+    parser.add_argument("--keyword-rate", type=float, default=0.6,
+                        help="Share of posts mentioning at least one theme keyword")
+    args = parser.parse_args()
+
+    write_dataset(args.output, args.n_posts, seed=args.seed, posts_per_account=args.posts_per_account,
+                  keyword_rate=args.keyword_rate)
+    print(f"Wrote {args.n_posts} posts to {args.output}")